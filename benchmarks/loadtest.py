@@ -0,0 +1,133 @@
+"""Load test untuk conveyor.service: request/detik dan latency p50/p90/p99.
+
+    python -m conveyor.service --port 8765 &
+    python benchmarks/loadtest.py --url http://127.0.0.1:8765 -c 64 -d 10
+    python benchmarks/loadtest.py --start -c 64 -d 10 --endpoint power   # start server sendiri
+
+Client asyncio murni (koneksi keep-alive, tanpa dependency tambahan). Setiap koneksi
+mengirim desain acak ke endpoint yang dipilih selama --duration detik.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+
+from conveyor import get_materials   # noqa: E402
+
+ENDPOINTS = ["calc", "geometry", "power", "components", "construction", "trajectory", "report"]
+
+
+def random_design(rng, materials):
+    return {"material": rng.choice(materials), "cap": rng.randint(50, 3000), "width": rng.choice([500, 650, 800, 1000, 1200, 1400, 1600, 2000]),
+            "speed": round(rng.uniform(0.5, 6.0), 1), "length": rng.randint(10, 3000), "lift": rng.randint(-20, 80),
+            "trough": rng.choice([20, 35, 45]), "lump": 0, "pulley_mm": rng.choice([315, 400, 500, 630, 800, 1000])}
+
+
+async def request(reader, writer, host, path, body=b"", method="POST"):
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        k, _, v = line.decode("latin-1").partition(":")
+        if k.strip().lower() == "content-length":
+            length = int(v)
+    return status, await reader.readexactly(length)
+
+
+async def worker(host, port, endpoint, deadline, seed, latencies, errors):
+    rng = random.Random(seed)
+    materials = list(get_materials())
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            ep = rng.choice(ENDPOINTS[:-1]) if endpoint == "mix" else endpoint
+            body = json.dumps(random_design(rng, materials)).encode()
+            t = time.perf_counter()
+            status, _ = await request(reader, writer, host, f"/{ep}", body)
+            latencies.append(time.perf_counter() - t)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run(url, concurrency, duration, endpoint):
+    u = urlsplit(url)
+    host, port = u.hostname, u.port or 80
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    t0 = time.perf_counter()
+    await asyncio.gather(*[worker(host, port, endpoint, deadline, i, latencies, errors) for i in range(concurrency)])
+    elapsed = time.perf_counter() - t0
+    reader, writer = await asyncio.open_connection(host, port)
+    _, health = await request(reader, writer, host, "/health", method="GET")
+    writer.close()
+    return latencies, errors, elapsed, json.loads(health)
+
+
+def wait_ready(url, timeout=30):
+    u = urlsplit(url)
+    end = time.time() + timeout
+    while time.time() < end:
+        try:
+            async def ping():
+                r, w = await asyncio.open_connection(u.hostname, u.port)
+                await request(r, w, u.hostname, "/health", method="GET")
+                w.close()
+            asyncio.run(ping())
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise SystemExit(f"error: service di {url} tidak merespon")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python benchmarks/loadtest.py", description="Load test conveyor.service.")
+    ap.add_argument("--url", default="http://127.0.0.1:8765")
+    ap.add_argument("-c", "--concurrency", type=int, default=32, help="jumlah koneksi paralel")
+    ap.add_argument("-d", "--duration", type=float, default=10.0, help="durasi (detik)")
+    ap.add_argument("--endpoint", default="calc", choices=ENDPOINTS + ["mix"])
+    ap.add_argument("--start", action="store_true", help="jalankan service sendiri (subprocess) di port --url")
+    ap.add_argument("--json", action="store_true", help="cetak hasil sebagai JSON")
+    args = ap.parse_args(argv)
+    proc = None
+    if args.start:
+        proc = subprocess.Popen([sys.executable, "-m", "conveyor.service", "--port", str(urlsplit(args.url).port)], cwd=ROOT, stdout=subprocess.DEVNULL)
+    try:
+        wait_ready(args.url)
+        latencies, errors, elapsed, health = asyncio.run(run(args.url, args.concurrency, args.duration, args.endpoint))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+    lat = np.asarray(latencies) * 1000
+    p50, p90, p99 = np.percentile(lat, [50, 90, 99]) if len(lat) else (float("nan"),) * 3
+    result = {"endpoint": args.endpoint, "concurrency": args.concurrency, "requests": len(lat), "errors": len(errors),
+              "req_per_s": len(lat) / elapsed, "p50_ms": float(p50), "p90_ms": float(p90), "p99_ms": float(p99),
+              "max_ms": float(lat.max()) if len(lat) else float("nan"), "mean_batch": health.get("mean_batch")}
+    if args.json:
+        print(json.dumps(result))
+    else:
+        print(f"{result['requests']:,} request ({result['errors']} error) dalam {elapsed:.1f} s, {args.concurrency} koneksi, /{args.endpoint}")
+        print(f"  {result['req_per_s']:,.0f} req/s | p50 {p50:.2f} ms | p90 {p90:.2f} ms | p99 {p99:.2f} ms | max {result['max_ms']:.2f} ms")
+        print(f"  rata-rata micro-batch di server: {result['mean_batch']:.1f} desain")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
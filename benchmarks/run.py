@@ -0,0 +1,354 @@
+"""Benchmark & regression suite: engine, figure rendering, PDF, dan rerun halaman.
+
+    python benchmarks/run.py                  # golden check + benchmark, append ke history
+    python benchmarks/run.py --quick --no-app # lebih cepat, tanpa AppTest
+    python benchmarks/run.py --update-golden  # tulis ulang golden.json dari engine sekarang
+    python benchmarks/run.py --strict         # exit 1 bila ada yang > --threshold lebih lambat
+
+Golden: beberapa kasus referensi per material (golden.json); hasil TitanEngine dan
+BatchEngine harus sama dengan nilai golden (rel. tol 1e-9). Jalur cepat lain
+(ProfileEngine satu flight, TrajectorySolver, CapacityTable, suku statis monitor,
+service.evaluate) dicek ekuivalen dengan TitanEngine untuk kasus yang sama. Setiap
+run ditambahkan sebagai satu baris JSON ke history.jsonl (commit, waktu, median/min
+per benchmark) dan dibandingkan dengan run sebelumnya.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+
+from conveyor import get_materials, TitanEngine, BatchEngine   # noqa: E402
+
+GOLDEN_FILE = os.path.join(HERE, "golden.json")
+HISTORY_FILE = os.path.join(HERE, "history.jsonl")
+REL_TOL = 1e-9
+# (nama, cap, width, speed, length, lift, trough, lump)
+CASES = [
+    ("default", 500, 800, 2.0, 100, 10, 35, 50),
+    ("long-incline", 1500, 1200, 3.0, 800, 40, 45, 100),
+    ("decline", 250, 650, 1.5, 300, -20, 20, 0),
+]
+GOLDEN_KEYS = {
+    "geometry": ["load_pct", "edge_act", "bw_act", "c_roll", "bw_max", "lump_ok", "max_lump"],
+    "power": ["kW", "T1", "T2", "Te", "PIW", "Wb", "Wm", "Slip", "Ratio"],
+    "components": ["Series", "Load", "RecPulley", "Curve"],
+    "construction": ["TransDist", "TakeupTravel"],
+}
+DEFAULT_DESIGN = ("Urea (Prills)", 500, 800, 2.0, 100, 10, 35, 50)
+
+
+# --- GOLDEN VALUES ---
+def _plain(v):
+    if isinstance(v, (np.bool_, bool)):
+        return bool(v)
+    if isinstance(v, (np.integer, int)):
+        return int(v)
+    if isinstance(v, (np.floating, float)):
+        return float(v)
+    return str(v)
+
+
+def engine_outputs(mat, case):
+    _, cap, w, v, L, H, tr, lump = case
+    eng = TitanEngine(get_materials()[mat], cap, w, v, L, H, tr, lump)
+    geo = eng.calc_geometry()
+    pwr = eng.calc_power_tension()
+    comp = eng.calc_components(pwr['T1'], pwr['Wm'], pwr['Wb'])
+    cons = eng.calc_construction_data(pwr['T1'], pwr['PIW'])
+    xt, yt, rp, idx = eng.calc_trajectory(630)
+    out = {}
+    for group, res in (("geometry", geo), ("power", pwr), ("components", comp), ("construction", cons)):
+        out.update({k: _plain(res[k]) for k in GOLDEN_KEYS[group]})
+    out.update({"traj_idx": float(idx), "traj_x_end": float(xt[-1]), "traj_y_end": float(yt[-1])})
+    return out
+
+
+def golden_cases():
+    return [(mat, case) for mat in get_materials() for case in CASES]
+
+
+def build_golden():
+    return {f"{mat}|{case[0]}": {"design": [mat, *case[1:]], "expected": engine_outputs(mat, case)} for mat, case in golden_cases()}
+
+
+def _same(a, b):
+    if isinstance(a, float) or isinstance(b, float):
+        return math.isclose(a, b, rel_tol=REL_TOL, abs_tol=1e-12)
+    return a == b
+
+
+def check_golden(golden):
+    """Bandingkan TitanEngine & BatchEngine dengan golden. Return list pesan mismatch."""
+    errors = []
+    keys = list(golden)
+    designs = [golden[k]["design"] for k in keys]
+    cols = list(zip(*designs))
+    batch = BatchEngine(*[np.array(c) for c in cols]).run()
+    for i, key in enumerate(keys):
+        mat, *rest = golden[key]["design"]
+        got = engine_outputs(mat, ("", *rest))
+        for name, exp in golden[key]["expected"].items():
+            if not _same(got[name], exp):
+                errors.append(f"{key}: TitanEngine {name} = {got[name]!r}, golden {exp!r}")
+            if name in batch and not _same(_plain(batch[name][i]), exp):
+                errors.append(f"{key}: BatchEngine {name} = {_plain(batch[name][i])!r}, golden {exp!r}")
+    return errors
+
+
+def check_equivalence(golden):
+    """Jalur cepat vs TitanEngine pada desain golden. Return list pesan mismatch."""
+    from conveyor.monitor import static_terms, ConveyorState
+    from conveyor.profile import ProfileEngine
+    from conveyor.service import evaluate
+    from conveyor.tables import get_table
+    from conveyor.trajectory import TrajectorySolver
+    errors = []
+    mat_db = get_materials()
+    table = get_table()
+    keys = list(golden)
+    designs = [golden[k]["design"] for k in keys]
+    served = evaluate([(*d, 630) for d in designs], mat_db)
+    terms = static_terms([{"conveyor_id": k, "material": d[0], "width": d[2], "speed": d[3], "length": d[4], "lift": d[5], "trough": d[6], "lump": d[7]}
+                          for k, d in zip(keys, designs)], mat_db)
+
+    def expect(key, path, got, exp):
+        if not _same(_plain(got), _plain(exp)):
+            errors.append(f"{key}: {path} = {_plain(got)!r}, TitanEngine {_plain(exp)!r}")
+
+    for i, key in enumerate(keys):
+        mat, cap, w, v, L, H, tr, lump = designs[i]
+        eng = TitanEngine(mat_db[mat], cap, w, v, L, H, tr, lump)
+        geo = eng.calc_geometry()
+        pwr = eng.calc_power_tension()
+        ref = engine_outputs(mat, ("", *designs[i][1:]))
+
+        prof = ProfileEngine(mat_db[mat], cap, w, v, [(L, H, 0)], tr, lump).calc_tension_profile()
+        # Pada decline ProfileEngine menaikkan T2 agar sag minimum terpenuhi di semua station,
+        # jadi T1/T2 hanya identik dengan aturan TitanEngine bila lift >= 0.
+        for k in ("Te", "kW") + (("T1", "T2") if H >= 0 else ()):
+            expect(key, f"ProfileEngine {k}", prof[k], pwr[k])
+
+        xt, yt, _, idx = eng.calc_trajectory(630)
+        solver = TrajectorySolver(w, [v], [630], streams=("center",))
+        xs, ys = solver.paths()
+        if not (np.allclose(xs[0, 0, 0], xt, rtol=REL_TOL, atol=1e-12) and np.allclose(ys[0, 0, 0], yt, rtol=REL_TOL, atol=1e-12)):
+            errors.append(f"{key}: TrajectorySolver center != calc_trajectory")
+        expect(key, "TrajectorySolver idx", solver.idx[0, 0, 0], idx)
+
+        expect(key, "CapacityTable.load_pct", table.load_pct(mat, w, v, cap, tr), geo["load_pct"])
+        expect(key, "CapacityTable.power", table.power(w, v, cap, L, H), pwr["kW"])
+
+        st = ConveyorState(key, {k: t[i] for k, t in terms.items()})
+        st.update(0.0, cap)
+        expect(key, "monitor load_pct", st.load, geo["load_pct"])
+        expect(key, "monitor kW", st.kW, pwr["kW"])
+        expect(key, "monitor ratio", st.ratio, pwr["Ratio"])
+
+        for sec, vals in served[i].items():
+            if sec == "trajectory":
+                expect(key, "service trajectory.idx", vals["idx"], idx)
+                expect(key, "service trajectory.x_end", vals["x"][-1], xt[-1])
+                expect(key, "service trajectory.y_end", vals["y"][-1], yt[-1])
+                continue
+            for k, got in vals.items():
+                expect(key, f"service {sec}.{k}", got, ref[k])
+    return errors
+
+
+# --- TIMING ---
+def timeit(fn, repeat=7, number=None, budget=0.2):
+    """Median & min waktu per panggilan (ms). number otomatis agar satu sampel ~budget/repeat detik."""
+    if number is None:
+        t = time.perf_counter(); fn(); one = time.perf_counter() - t
+        number = max(1, int(budget / repeat / max(one, 1e-7)))
+    samples = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - t) / number * 1000)
+    return {"median_ms": statistics.median(samples), "min_ms": min(samples), "n": number * repeat}
+
+
+def bench_engine(quick):
+    mat, cap, w, v, L, H, tr, lump = DEFAULT_DESIGN
+    m = get_materials()[mat]
+    eng = TitanEngine(m, cap, w, v, L, H, tr, lump)
+    pwr = eng.calc_power_tension()
+    rows = 10_000 if quick else 100_000
+    rng = np.random.default_rng(0)
+    batch = BatchEngine(rng.choice(list(get_materials()), rows), rng.uniform(50, 3000, rows), rng.choice([500, 800, 1200, 2000], rows),
+                        rng.uniform(0.5, 6, rows).round(1), rng.uniform(10, 3000, rows), rng.uniform(-20, 80, rows), rng.choice([20, 35, 45], rows), 0)
+    return {
+        "engine.init": timeit(lambda: TitanEngine(m, cap, w, v, L, H, tr, lump)),
+        "engine.calc_geometry": timeit(eng.calc_geometry),
+        "engine.calc_power_tension": timeit(eng.calc_power_tension),
+        "engine.calc_components": timeit(lambda: eng.calc_components(pwr['T1'], pwr['Wm'], pwr['Wb'])),
+        "engine.calc_construction_data": timeit(lambda: eng.calc_construction_data(pwr['T1'], pwr['PIW'])),
+        "engine.calc_trajectory": timeit(lambda: eng.calc_trajectory(630)),
+        f"batch.run_{rows}": timeit(batch.run, repeat=3 if quick else 5),
+    }
+
+
+def bench_figures(quick):
+    """Render figure tiap tab langsung lewat conveyor.plots (tanpa cache aplikasi)."""
+    from conveyor import plots
+    from conveyor.optimizer import optimize
+    from conveyor.profile import ProfileEngine
+    from conveyor.tables import get_table
+    from conveyor.trajectory import TrajectorySolver, chute_outline, PULLEY_SIZES, SPEED_RANGE
+    from conveyor.uncertainty import run_monte_carlo
+    mat, cap, w, v, L, H, tr, lump = DEFAULT_DESIGN
+    m = get_materials()[mat]
+    eng = TitanEngine(m, cap, w, v, L, H, tr, lump)
+    geo = eng.calc_geometry()
+    xt, yt, rp, idx = eng.calc_trajectory(630)
+    pts, _ = chute_outline(rp, float(np.max(xt)), 1.5, 2.5, 0.8)
+    solver = TrajectorySolver(w, SPEED_RANGE, PULLEY_SIZES)
+    imp = solver.impacts(pts)
+    xg = np.linspace(pts[:, 0].min(), pts[:, 0].max(), 400)
+    lo, hi = solver.envelope(xg)
+    hit = imp['surface'] >= 0
+    spd = np.broadcast_to(solver.speeds, hit.shape)
+    prof = ProfileEngine(m, cap, w, v, [(L, H, 0)], tr, lump).calc_tension_profile()
+    opt, front = optimize(cap, L, H, lump, [mat])
+    mc = run_monte_carlo(DEFAULT_DESIGN, 100_000, seed=1)
+    rep = 3 if quick else 5
+    return {
+        "compute.trajectory_solver": timeit(lambda: TrajectorySolver(w, SPEED_RANGE, PULLEY_SIZES).impacts(pts), repeat=rep),
+        "compute.monte_carlo_200k": timeit(lambda: run_monte_carlo(DEFAULT_DESIGN, 200_000, seed=1), repeat=rep),
+        "fig.cross_section": timeit(lambda: plots.cross_section(w/25.4, geo['c_roll'], geo['bw_max'], tr, m['sur'], geo['load_pct'], lump), repeat=rep),
+        "fig.trajectory": timeit(lambda: plots.trajectory(xt, yt, rp, idx, 1.5, 2.5, 0.8), repeat=rep),
+        "fig.trajectory_envelope": timeit(lambda: plots.trajectory_envelope(xg, lo, hi, pts, imp['x'][hit], imp['y'][hit], spd[hit]), repeat=rep),
+        "fig.tension_envelope": timeit(lambda: plots.tension_envelope(prof['x'], prof['z'], prof['T_carry'], prof['T_return']), repeat=rep),
+        "fig.capacity_chart": timeit(lambda: get_table().chart(mat, tr, 85), repeat=rep),
+        "fig.pareto_front": timeit(lambda: plots.pareto_front(opt['kW'], opt['PIW'], opt['load_pct'], front), repeat=rep),
+        "fig.uncertainty_hist": timeit(lambda: plots.uncertainty_hist(mc['load_hist'], mc['kW_hist'], mc['kW_p95']), repeat=rep),
+    }
+
+
+def bench_pdf(quick):
+    from conveyor.report import create_pdf
+    return {"pdf.create_pdf": timeit(lambda: create_pdf(DEFAULT_DESIGN), repeat=3 if quick else 5)}
+
+
+def bench_app(quick):
+    """Rerun penuh main_app.py lewat streamlit.testing (cold = semua cache dikosongkan)."""
+    from streamlit.testing.v1 import AppTest
+    from conveyor.cache import REGISTRY
+
+    def run(clear):
+        if clear:
+            for c in REGISTRY.values():
+                c.clear()
+        at = AppTest.from_file(os.path.join(ROOT, "main_app.py"), default_timeout=120).run()
+        if at.exception:
+            raise RuntimeError(f"main_app.py error: {at.exception[0].message}")
+    run(True)   # warm-up import streamlit/matplotlib
+    rep = 2 if quick else 3
+    return {"app.rerun_cold": timeit(lambda: run(True), repeat=rep, number=1),
+            "app.rerun_warm": timeit(lambda: run(False), repeat=rep, number=1)}
+
+
+# --- HISTORY ---
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=10)
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT, capture_output=True, text=True, timeout=30)
+        return out.stdout.strip() + ("-dirty" if dirty.stdout.strip() else "") if out.returncode == 0 else None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def last_entry(path):
+    if not os.path.exists(path):
+        return None
+    last = None
+    with open(path) as fh:
+        for line in fh:
+            if line.strip():
+                last = line
+    return json.loads(last) if last else None
+
+
+def compare(results, prev, threshold):
+    """Cetak perbandingan dengan run sebelumnya. Return daftar benchmark yang melambat > threshold."""
+    slower = []
+    for name, r in results.items():
+        old = (prev or {}).get("results", {}).get(name)
+        delta = ""
+        if old:
+            change = r["median_ms"] / old["median_ms"] - 1
+            delta = f"{change*100:+7.1f}%"
+            if change > threshold:
+                slower.append(name); delta += "  << REGRESSION"
+        print(f"  {name:<34} {r['median_ms']:>11.4f} ms  (min {r['min_ms']:.4f}, n={r['n']}) {delta}")
+    return slower
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python benchmarks/run.py", description="Benchmark & golden regression untuk conveyor.")
+    ap.add_argument("--quick", action="store_true", help="sampel lebih sedikit")
+    ap.add_argument("--no-app", action="store_true", help="lewati rerun AppTest")
+    ap.add_argument("--only", choices=["engine", "figures", "pdf", "app"], action="append", help="jalankan grup tertentu saja")
+    ap.add_argument("--update-golden", action="store_true", help="tulis ulang golden.json lalu keluar")
+    ap.add_argument("--history", default=HISTORY_FILE, help="file history JSONL (default benchmarks/history.jsonl)")
+    ap.add_argument("--no-save", action="store_true", help="jangan tulis ke history")
+    ap.add_argument("--threshold", type=float, default=0.20, help="batas melambat vs run sebelumnya (default 0.20 = 20%%)")
+    ap.add_argument("--strict", action="store_true", help="exit 1 bila ada regresi waktu")
+    args = ap.parse_args(argv)
+
+    if args.update_golden:
+        golden = build_golden()
+        with open(GOLDEN_FILE, "w") as fh:
+            json.dump(golden, fh, indent=1, sort_keys=True)
+            fh.write("\n")
+        print(f"{len(golden)} kasus golden ditulis ke {GOLDEN_FILE}")
+        return 0
+
+    with open(GOLDEN_FILE) as fh:
+        golden = json.load(fh)
+    errors = check_golden(golden)
+    print(f"golden: {len(golden)} kasus, {len(errors)} mismatch")
+    for e in errors[:50]:
+        print(f"  {e}")
+    equiv = check_equivalence(golden)
+    print(f"ekuivalensi jalur cepat vs TitanEngine: {len(equiv)} mismatch")
+    for e in equiv[:50]:
+        print(f"  {e}")
+    errors += equiv
+
+    groups = args.only or ["engine", "figures", "pdf"] + ([] if args.no_app else ["app"])
+    bench = {"engine": bench_engine, "figures": bench_figures, "pdf": bench_pdf, "app": bench_app}
+    results = {}
+    for g in groups:
+        results.update(bench[g](args.quick))
+
+    prev = last_entry(args.history)
+    print(f"benchmark (vs {prev['commit'] if prev else 'tidak ada run sebelumnya'}):")
+    slower = compare(results, prev, args.threshold)
+    entry = {"timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"), "commit": git_commit(),
+             "python": platform.python_version(), "numpy": np.__version__, "machine": platform.machine(),
+             "quick": args.quick, "golden_cases": len(golden), "golden_errors": len(errors), "results": results}
+    if not args.no_save:
+        with open(args.history, "a") as fh:
+            fh.write(json.dumps(entry) + "\n")
+    if errors:
+        return 1
+    return 1 if (args.strict and slower) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
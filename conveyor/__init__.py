@@ -0,0 +1,22 @@
+"""Core perhitungan belt conveyor (CEMA) tanpa efek samping Streamlit.
+
+`from conveyor import TitanEngine` hanya memuat modul standar (math). numpy, pandas,
+matplotlib dan fpdf baru dimuat saat fiturnya dipakai: BatchEngine (numpy),
+EngineeringReport / create_pdf (fpdf), conveyor.plots (matplotlib), conveyor.audit
+(pandas / pyarrow).
+"""
+import importlib
+
+from .engine import get_materials, get_idler_limits, get_min_pulley, TitanEngine
+
+_LAZY = {"BatchEngine": "batch", "BATCH_COLUMNS": "batch", "EngineeringReport": "report", "create_pdf": "report"}
+
+__all__ = ["get_materials", "get_idler_limits", "get_min_pulley", "TitanEngine", *_LAZY]
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(f".{_LAZY[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
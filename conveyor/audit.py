@@ -0,0 +1,242 @@
+"""Fleet audit: evaluasi inventori conveyor terpasang tanpa Streamlit.
+
+    python -m conveyor.audit inventory.csv audit.csv
+    python -m conveyor.audit inventory.parquet audit.parquet --chunksize 200000
+
+Kolom wajib: material, cap, width, speed, length, lift, motor_kw, pulley_mm.
+Kolom opsional: trough (default 35), lump (default 0). Baris dengan input angka kosong /
+tidak valid (atau material kosong) tidak dihitung: hasil & flag-nya dikosongkan (NA)
+dan jumlahnya dilaporkan di ringkasan. Kolom lain (mis. conveyor_id)
+diteruskan apa adanya ke output (dibaca sebagai teks). File dibaca & ditulis per
+chunk, jadi memori tetap konstan berapapun ukuran inventorinya. Output ditulis ke
+file sementara di folder yang sama dan baru di-rename setelah selesai, jadi run
+yang gagal tidak meninggalkan file setengah jadi.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from .engine import get_materials
+from .batch import BatchEngine
+from .common import DEFAULTS
+
+REQUIRED_COLUMNS = ["material", "cap", "width", "speed", "length", "lift", "motor_kw", "pulley_mm"]
+NUMERIC_COLUMNS = REQUIRED_COLUMNS[1:] + list(DEFAULTS)
+POSITIVE_COLUMNS = ["cap", "width", "speed", "length"]
+FLAG_COLUMNS = ["flag_motor_undersized", "flag_pulley_undersized", "flag_overload", "flag_slip"]
+CHUNK_SIZE = 100000
+
+
+def valid_rows(df):
+    """Mask baris yang bisa dihitung: material terisi, kolom angka hingga, cap/width/speed/length > 0."""
+    ok = df["material"].notna().to_numpy(copy=True)
+    for c in NUMERIC_COLUMNS:
+        if c in df.columns:
+            s = df[c]
+            v = s.to_numpy(dtype=float) if pd.api.types.is_numeric_dtype(s) else pd.to_numeric(s, errors="coerce").to_numpy(dtype=float)
+            ok &= np.isfinite(v)
+            if c in POSITIVE_COLUMNS:
+                ok &= v > 0
+    return ok
+
+
+def _expand(values, valid, dtype):
+    """Sebar hasil baris valid ke seluruh chunk; baris tidak valid = NA."""
+    out = pd.array([pd.NA] * len(valid), dtype=dtype)
+    out[valid] = values
+    return out
+
+
+def audit_frame(df, mat_db=None):
+    """Hitung hasil audit untuk satu chunk inventori (DataFrame)."""
+    mat_db = mat_db or get_materials()
+    missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"kolom wajib tidak ada: {', '.join(missing)}")
+    valid = valid_rows(df)
+    src = df if valid.all() else df[valid]
+    unknown = set(src["material"].unique()) - set(mat_db)
+    if unknown:
+        raise ValueError(f"material tidak dikenal: {', '.join(sorted(map(str, unknown)))}")
+    col = lambda c: src[c].to_numpy(dtype=float) if c in src.columns else DEFAULTS[c]
+    eng = BatchEngine(src["material"].to_numpy(dtype=str), col("cap"), col("width"), col("speed"), col("length"), col("lift"), col("trough"), col("lump"), mat_db=mat_db)
+    geo = eng.calc_geometry()
+    pwr = eng.calc_power_tension()
+    comp = eng.calc_components(pwr['T1'], pwr['Wm'], pwr['Wb'])
+    res = {"load_pct": geo["load_pct"], "kW": pwr["kW"], "PIW": pwr["PIW"], "slip_ratio": pwr["Ratio"], "min_pulley_mm": comp["RecPulley"],
+           "flag_motor_undersized": col("motor_kw") < pwr["kW"], "flag_pulley_undersized": col("pulley_mm") < comp["RecPulley"],
+           "flag_overload": geo["load_pct"] > 100, "flag_slip": pwr["Slip"]}
+    out = df.copy()
+    for k, v in res.items():
+        if src is not df:
+            v = _expand(v, valid, "boolean" if k in FLAG_COLUMNS else "Int64" if k == "min_pulley_mm" else "Float64")
+        out[k] = v
+    return out
+
+
+def _is_parquet(path):
+    return str(path).lower().endswith((".parquet", ".pq"))
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("error: file Parquet butuh paket 'pyarrow' (pip install pyarrow)")
+    return pa, pq
+
+
+def _optional_pyarrow_csv():
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pcsv
+    except ImportError:
+        return None, None
+    return pa, pcsv
+
+
+def _csv_dtypes(path):
+    """dtype tetap per kolom CSV: kolom angka -> float, lainnya (material, conveyor_id, ...) -> str.
+
+    read_csv(chunksize) menebak dtype per chunk; tanpa ini conveyor_id angka di chunk
+    pertama lalu "CV-9" di chunk berikutnya menghasilkan schema yang berbeda.
+    """
+    numeric = set(REQUIRED_COLUMNS[1:]) | set(DEFAULTS)
+    return {c: float if c in numeric else str for c in pd.read_csv(path, nrows=0).columns}
+
+
+def read_chunks(path, chunksize=CHUNK_SIZE):
+    if _is_parquet(path):
+        _, pq = _require_pyarrow()
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize, dtype=_csv_dtypes(path))
+
+
+class ChunkWriter:
+    """Tulis DataFrame per chunk ke CSV atau Parquet (streaming).
+
+    CSV ditulis lewat pyarrow bila tersedia (~8x lebih cepat dari DataFrame.to_csv
+    untuk kolom float), selain itu fallback ke pandas. Data masuk ke file sementara;
+    close() me-rename ke path tujuan, abort() menghapusnya.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        fd, self.tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=".audit-", suffix=os.path.splitext(path)[1])
+        os.close(fd)
+        self.parquet = _is_parquet(path)
+        if self.parquet:
+            self._pa, self._mod = _require_pyarrow()
+        else:
+            self._pa, self._mod = _optional_pyarrow_csv()
+        self._writer = None
+        self._schema = None
+        self._fh = None
+
+    def write(self, df):
+        if self._pa is None:
+            first = self._fh is None
+            if first:
+                self._fh = open(self.tmp, "w", newline="")
+            df.to_csv(self._fh, header=first, index=False)
+            return
+        table = self._pa.Table.from_pandas(df, preserve_index=False)
+        if self._writer is None:
+            # kolom yang kosong semua di chunk pertama bertipe null; ambil string agar chunk berikutnya tetap bisa di-cast
+            pa = self._pa
+            self._schema = pa.schema([f.with_type(pa.string()) if pa.types.is_null(f.type) else f for f in table.schema], metadata=table.schema.metadata)
+            if self.parquet:
+                self._writer = self._mod.ParquetWriter(self.tmp, self._schema)
+            else:
+                self._writer = self._mod.CSVWriter(self.tmp, self._schema)
+        self._writer.write_table(table.cast(self._schema))
+
+    def _close_files(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def close(self):
+        self._close_files()
+        os.chmod(self.tmp, 0o644)
+        os.replace(self.tmp, self.path)
+
+    def abort(self):
+        try:
+            self._close_files()
+        finally:
+            try:
+                os.remove(self.tmp)
+            except FileNotFoundError:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def run_audit(src, dst, chunksize=CHUNK_SIZE, log=sys.stderr):
+    """Stream inventori src -> dst. Return ringkasan (rows, detik, jumlah flag)."""
+    rows = invalid = 0
+    invalid_rows = []     # nomor baris data (1-based) tidak valid, maks 10 untuk ringkasan
+    flags = dict.fromkeys(FLAG_COLUMNS, 0)
+    mat_db = get_materials()
+    t0 = time.perf_counter()
+    with ChunkWriter(dst) as writer:
+        for chunk in read_chunks(src, chunksize):
+            res = audit_frame(chunk, mat_db)
+            writer.write(res)
+            bad = np.flatnonzero(res["load_pct"].isna().to_numpy())
+            invalid += len(bad)
+            invalid_rows += [rows + int(i) + 1 for i in bad[:10 - len(invalid_rows)]]
+            rows += len(res)
+            for k in flags:
+                flags[k] += int(res[k].sum()) if len(bad) else int(np.count_nonzero(res[k].to_numpy()))
+            if log:
+                dt = time.perf_counter() - t0
+                print(f"{rows:,} rows | {rows / dt if dt else 0:,.0f} rows/s", file=log)
+    return {"rows": rows, "seconds": time.perf_counter() - t0, "invalid": invalid, "invalid_rows": invalid_rows, **flags}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m conveyor.audit", description="Audit inventori belt conveyor (CEMA) dari file CSV/Parquet.")
+    ap.add_argument("inventory", help="file inventori input (.csv / .parquet)")
+    ap.add_argument("output", help="file hasil audit (.csv / .parquet)")
+    ap.add_argument("--chunksize", type=int, default=CHUNK_SIZE, help=f"baris per chunk (default {CHUNK_SIZE})")
+    ap.add_argument("-q", "--quiet", action="store_true", help="tanpa log progress per chunk")
+    args = ap.parse_args(argv)
+    try:
+        s = run_audit(args.inventory, args.output, args.chunksize, log=None if args.quiet else sys.stderr)
+    except (ValueError, FileNotFoundError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    rate = s["rows"] / s["seconds"] if s["seconds"] else 0
+    print(f"Audit selesai: {s['rows']:,} rows dalam {s['seconds']:.2f} s ({rate:,.0f} rows/s)")
+    print(f"  Motor undersized : {s['flag_motor_undersized']:,}")
+    print(f"  Pulley undersized: {s['flag_pulley_undersized']:,}")
+    print(f"  Overload (>100%) : {s['flag_overload']:,}")
+    print(f"  Slip (ratio > 3) : {s['flag_slip']:,}")
+    if s["invalid"]:
+        more = ", ..." if s["invalid"] > len(s["invalid_rows"]) else ""
+        print(f"  Input tidak valid: {s['invalid']:,} (hasil & flag dikosongkan; baris data {', '.join(map(str, s['invalid_rows']))}{more})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+import math
+import numpy as np
+
+from .engine import get_materials, IDLER_LIMITS, MIN_PULLEY
+
+# --- BATCH ENGINE (VECTORIZED) ---
+# Versi array dari TitanEngine: satu baris = satu desain conveyor.
+# Urutan operasi sengaja disamakan dengan versi skalar supaya hasilnya identik.
+
+BATCH_COLUMNS = ["material", "cap", "width", "speed", "length", "lift", "trough", "lump"]
+
+_IDLER_W_BREAKS = np.array([w_max for w_max, _ in IDLER_LIMITS[:-1]], dtype=float)
+_PULLEY_BREAKS = np.array([piw_max for piw_max, _ in MIN_PULLEY[:-1]], dtype=float)
+_PULLEY_DIA = np.array([dia for _, dia in MIN_PULLEY])
+
+
+def _exact(fn, arr):
+    # Evaluasi fungsi math per nilai unik (sudut trough/surcharge hanya sedikit variasinya),
+    # agar bit-for-bit sama dengan math.sin/math.tan pada engine skalar.
+    uniq, inv = np.unique(arr, return_inverse=True)
+    return np.array([fn(u) for u in uniq], dtype=float)[inv].reshape(arr.shape)
+
+
+def idler_series(width_in, load):
+    """Vectorized get_idler_limits + pemilihan seri pertama dengan load < limit."""
+    width_in, load = np.broadcast_arrays(np.asarray(width_in, dtype=float), np.asarray(load, dtype=float))
+    w_cls = np.searchsorted(_IDLER_W_BREAKS, width_in, side='left')
+    series = np.full(load.shape, "E", dtype="<U1")
+    for i, (_, limits) in enumerate(IDLER_LIMITS):
+        mask = w_cls == i
+        if not mask.any():
+            continue
+        names = np.array(list(limits.keys()) + ["E"], dtype="<U1")
+        lims = np.array(list(limits.values()), dtype=float)
+        series[mask] = names[np.searchsorted(lims, load[mask], side='right')]
+    return series
+
+
+def min_pulley(piw):
+    """Vectorized get_min_pulley."""
+    return _PULLEY_DIA[np.searchsorted(_PULLEY_BREAKS, np.asarray(piw, dtype=float), side='left')]
+
+
+class BatchEngine:
+    def __init__(self, material, cap, w_mm, v_mps, l_m, h_m, trough_deg, lump_mm, mat_db=None, den=None, sur=None, exact=True):
+        """den/sur (opsional) menimpa properti material per baris, mis. sampel Monte Carlo.
+
+        exact=False memakai np.sin/np.tan langsung (beda di digit terakhir dengan engine
+        skalar); perlu bila sudut surcharge bernilai kontinu sehingga hampir semua unik.
+        """
+        self.exact = exact
+        arrs = np.broadcast_arrays(np.asarray(material), *[np.asarray(x, dtype=float) for x in (cap, w_mm, v_mps, l_m, h_m, trough_deg, lump_mm)])
+        material, cap, w_mm, v_mps, l_m, h_m, trough_deg, lump_mm = [np.atleast_1d(a) for a in arrs]
+        if den is None or sur is None:
+            mat_db = mat_db or get_materials()
+            names, inv = np.unique(material, return_inverse=True)
+            inv = inv.reshape(material.shape)
+        self.den = np.broadcast_to(np.asarray(den, dtype=float), cap.shape) if den is not None else np.array([mat_db[n]['den'] for n in names], dtype=float)[inv]
+        self.sur = np.broadcast_to(np.asarray(sur, dtype=float), cap.shape) if sur is not None else np.array([mat_db[n]['sur'] for n in names], dtype=float)[inv]
+        self.Q = cap * 1.1023
+        self.W_in = w_mm / 25.4
+        self.V_fpm = v_mps * 196.85
+        self.L = l_m * 3.281
+        self.H = h_m * 3.281
+        self.trough_deg = trough_deg
+        self.lump_mm = lump_mm
+
+    @classmethod
+    def from_frame(cls, df, mat_db=None):
+        """Bangun dari DataFrame / dict kolom dengan nama di BATCH_COLUMNS."""
+        return cls(*[np.asarray(df[c]) for c in BATCH_COLUMNS], mat_db=mat_db)
+
+    def _trig(self, name, deg):
+        if self.exact:
+            fn = getattr(math, name)
+            return _exact(lambda d: fn(math.radians(d)), deg)
+        return getattr(np, name)(np.radians(deg))
+
+    def calc_geometry(self):
+        edge_std = 0.055 * self.W_in + 0.9
+        bw_max = self.W_in - (2 * edge_std)
+        c_roll = 0.371 * self.W_in
+        h_wing = ((bw_max - c_roll)/2) * self._trig("sin", self.trough_deg)
+        area_trap = (c_roll * h_wing) + (((bw_max - c_roll)/2) * h_wing)
+        area_sur = (bw_max**2 * self._trig("tan", self.sur)) / 6
+        design_cap = ((area_trap + area_sur)/144 * self.V_fpm * 60 * self.den) / 2000
+        with np.errstate(divide='ignore', invalid='ignore'):
+            load_pct = np.where(design_cap > 0, self.Q / design_cap * 100, 0.0)
+        bw_act = np.where(load_pct > 0, bw_max * np.sqrt(np.maximum(load_pct, 0)/100), 0.0)
+        edge_act = (self.W_in - bw_act)/2
+
+        # Lump Check
+        max_allowed_lump = self.W_in / 3 * 25.4
+        is_lump_ok = self.lump_mm <= max_allowed_lump
+
+        return {"load_pct": load_pct, "edge_act": edge_act, "bw_act": bw_act, "c_roll": c_roll, "bw_max": bw_max, "lump_ok": is_lump_ok, "max_lump": max_allowed_lump, "design_cap": design_cap}
+
+    def calc_power_tension(self):
+        Wb = 3 + (self.W_in / 4)
+        Wm = (33.3 * self.Q) / self.V_fpm
+        Tac = 200 + (5 * self.W_in)
+        Ky = np.where(self.L < 500, 0.035, 0.025)
+        Te = self.L * (0.2 + Ky*Wb + 0.015*Wb) + Wm*(self.L*Ky + self.H) + Tac
+        T2 = np.maximum(Te * 0.35, 12.5*(Wb+Wm))
+        T1 = Te + T2
+        PIW = T1 / self.W_in
+        HP = (Te * self.V_fpm) / 33000
+        kW = HP * 0.746 / 0.90
+        trac_ratio = T1/T2
+        is_slip = trac_ratio > 3.0
+        return {"kW": kW, "T1": T1, "T2": T2, "Te": Te, "PIW": PIW, "Wb": Wb, "Wm": Wm, "Slip": is_slip, "Ratio": trac_ratio}
+
+    def calc_components(self, T1, Wm, Wb):
+        spacing = np.where(Wm < 100, 4.0, 3.0)
+        load = (Wb + Wm) * spacing
+        series = idler_series(self.W_in, load)
+        rec_p = min_pulley(T1/self.W_in)
+        r_min = (1.6 * T1) / Wb * 0.3048
+        return {"Series": series, "Load": load, "RecPulley": rec_p, "Curve": r_min}
+
+    def calc_construction_data(self, T1, PIW):
+        trough_factor = np.where(self.trough_deg == 35, 3.2, np.where(self.trough_deg == 45, 4.0, 2.0))
+        trans_dist_m = (trough_factor * self.W_in) * 0.0254
+        takeup_len_m = self.L * 0.3048 * 0.015
+        return {"TransDist": trans_dist_m, "TakeupTravel": takeup_len_m}
+
+    def run(self):
+        """Semua perhitungan sekaligus, hasil berupa dict kolom (siap dijadikan DataFrame)."""
+        geo = self.calc_geometry()
+        pwr = self.calc_power_tension()
+        comp = self.calc_components(pwr['T1'], pwr['Wm'], pwr['Wb'])
+        cons = self.calc_construction_data(pwr['T1'], pwr['PIW'])
+        return {**geo, **pwr, **comp, **cons}
@@ -0,0 +1,74 @@
+import functools
+import threading
+import time
+from collections import OrderedDict
+
+# --- RESULT CACHE ---
+# Cache berbasis input (LRU + TTL) yang hidup di level proses, sehingga dipakai
+# bersama oleh semua rerun & semua sesi Streamlit di server yang sama.
+
+REGISTRY = {}
+
+
+class TTLCache:
+    """LRU cache thread-safe dengan batas jumlah entry, TTL, dan statistik hit/miss."""
+
+    def __init__(self, name, maxsize=256, ttl=None):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expired = 0
+        REGISTRY[name] = self
+
+    def get_or_compute(self, key, fn, *args, **kwargs):
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                if self.ttl is None or now - item[0] < self.ttl:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return item[1]
+                del self._data[key]
+                self.expired += 1
+            self.misses += 1
+        # Hitung di luar lock agar sesi lain tidak ikut menunggu.
+        value = fn(*args, **kwargs)
+        with self._lock:
+            self._data[key] = (now, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def __call__(self, fn):
+        """Dekorator: memoize fn berdasarkan nama fungsi + argumen (harus hashable)."""
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = (fn.__qualname__, args, tuple(sorted(kwargs.items())))
+            return self.get_or_compute(key, fn, *args, **kwargs)
+        return wrapper
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {"cache": self.name, "entries": len(self._data), "maxsize": self.maxsize, "ttl_s": self.ttl,
+                    "hits": self.hits, "misses": self.misses, "hit_rate": self.hits / total if total else 0.0,
+                    "evictions": self.evictions, "expired": self.expired}
+
+
+def cache_stats():
+    return [c.stats() for c in REGISTRY.values()]
+
+
+engine_cache = TTLCache("engine", maxsize=1024, ttl=3600)
+figure_cache = TTLCache("figure", maxsize=256, ttl=1800)
+# PDF memuat timestamp "Generated on", jadi TTL dibuat pendek.
+pdf_cache = TTLCache("pdf", maxsize=64, ttl=600)
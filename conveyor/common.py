@@ -0,0 +1,47 @@
+"""Helper bersama CLI / service (hanya stdlib, aman di-import di mana saja).
+
+Default desain & pembaca CSV desain/inventori (report, monitor, audit, service),
+faktor kW dari Te (tables, monitor), dan jumlah CPU yang boleh dipakai proses ini
+(optimizer, report, service).
+"""
+import csv
+import os
+
+DEFAULTS = {"trough": 35, "lump": 0}
+# kW = KW_FACTOR * Te[lbs] * V[fpm]  (HP = Te V / 33000, efisiensi drive 0.90)
+KW_FACTOR = 0.746 / 0.90 / 33000
+
+
+def cpu_count():
+    """CPU yang boleh dipakai proses ini (affinity Linux), fallback ke os.cpu_count()."""
+    return len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+
+
+def parse_number(s):
+    v = float(s)
+    return int(v) if v.is_integer() else v
+
+
+def read_rows(fh, columns, mat_db, id_columns=("tag", "conveyor_id")):
+    """Stream (tag, dict) dari CSV desain/inventori (file-like text), baris demi baris.
+
+    `columns`: kolom angka yang dibaca (kolom di DEFAULTS boleh kosong). Tag diambil dari
+    kolom pertama di `id_columns` yang terisi, selain itu "BC-001", "BC-002", ... Baris
+    dengan material tidak dikenal, kolom wajib kosong atau angka tidak valid menghasilkan
+    ValueError yang menyebut nomor barisnya.
+    """
+    reader = csv.DictReader(fh)
+    for i, row in enumerate(reader, start=1):
+        row = {k.strip().lower(): (v or "").strip() for k, v in row.items() if k}
+        tag = next((row[c] for c in id_columns if row.get(c)), f"BC-{i:03d}")
+        try:
+            out = {"material": row["material"]}
+            for c in columns:
+                out[c] = parse_number(row[c]) if row.get(c) else DEFAULTS[c]
+        except KeyError as e:
+            raise ValueError(f"baris {reader.line_num} ({tag}): kolom {e.args[0]} kosong / tidak ada") from None
+        except ValueError as e:
+            raise ValueError(f"baris {reader.line_num} ({tag}): nilai tidak valid ({e})") from None
+        if out["material"] not in mat_db:
+            raise ValueError(f"baris {reader.line_num} ({tag}): material tidak dikenal: {out['material']!r}")
+        yield tag, out
@@ -0,0 +1,114 @@
+import math
+
+# --- DATABASE MATERIAL ---
+def get_materials():
+    return {
+        "Urea (Prills)": {"den": 45, "rep": 30, "sur": 20, "max_v": 600, "desc": "Produk Urea butiran kecil. Berdebu & Higroskopis.", "liner": "SS304 / UHMWPE"}, 
+        "Urea (Granul)": {"den": 48, "rep": 32, "sur": 25, "max_v": 650, "desc": "Produk Urea butiran besar. Flowability baik.", "liner": "SS304"},
+        "ZA (Ammonium Sulfate)": {"den": 60, "rep": 32, "sur": 25, "max_v": 550, "desc": "Kristal/Granul. Sifat Korosif Tinggi (Asam).", "liner": "SS316L"},
+        "NPK (Phonska)": {"den": 62, "rep": 34, "sur": 25, "max_v": 600, "desc": "Butiran Majemuk. Korosif & Abrasif sedang.", "liner": "SS304 / AR Steel"},
+        "SP-36": {"den": 70, "rep": 35, "sur": 25, "max_v": 600, "desc": "Butiran abu-abu. Debu fosfat.", "liner": "AR400 / SS304"},
+        "Petroganik": {"den": 40, "rep": 35, "sur": 25, "max_v": 500, "desc": "Pupuk Organik. Ringan, berserat, bridging.", "liner": "UHMWPE"},
+        "Batuan Fosfat": {"den": 85, "rep": 40, "sur": 30, "max_v": 800, "desc": "Bahan baku. Sangat Abrasif & Berat.", "liner": "Ceramic Tile"},
+        "Sulfur": {"den": 65, "rep": 35, "sur": 25, "max_v": 500, "desc": "Bahaya ledakan debu & statis.", "liner": "SS304 (Spark Free)"},
+        "Kapur (Limestone)": {"den": 90, "rep": 38, "sur": 30, "max_v": 800, "desc": "Penetral pH. Berat & Berdebu.", "liner": "AR400 Steel"},
+        "Batu Bara": {"den": 50, "rep": 35, "sur": 25, "max_v": 900, "desc": "Fuel Boiler.", "liner": "AR400 Steel"},
+    }
+
+# Tabel batas idler per kelas lebar belt (inch) & diameter pulley minimum per PIW.
+# Dipakai oleh lookup skalar di bawah dan versi vectorized di conveyor.batch.
+IDLER_LIMITS = [
+    (36, {"B": 410, "C": 900, "D": 1200}),
+    (48, {"B": 410, "C": 900, "D": 1200}),
+    (math.inf, {"C": 850, "D": 1200, "E": 1800}),
+]
+
+MIN_PULLEY = [(150, 315), (250, 400), (400, 500), (600, 630), (800, 800), (math.inf, 1000)]
+
+def get_idler_limits(width_in):
+    for w_max, limits in IDLER_LIMITS:
+        if width_in <= w_max: return dict(limits)
+    return dict(IDLER_LIMITS[-1][1])
+
+def get_min_pulley(piw):
+    for piw_max, dia in MIN_PULLEY:
+        if piw <= piw_max: return dia
+    return MIN_PULLEY[-1][1]
+
+# --- CALCULATION ENGINE ---
+class TitanEngine:
+    def __init__(self, mat_props, cap, w_mm, v_mps, l_m, h_m, trough_deg, lump_mm):
+        self.mat = mat_props
+        self.Q = cap * 1.1023 
+        self.W_in = w_mm / 25.4
+        self.V_fpm = v_mps * 196.85
+        self.L = l_m * 3.281
+        self.H = h_m * 3.281
+        self.trough = math.radians(trough_deg)
+        self.trough_deg = trough_deg
+        self.lump_mm = lump_mm
+        
+    def calc_geometry(self):
+        edge_std = 0.055 * self.W_in + 0.9
+        bw_max = self.W_in - (2 * edge_std)
+        c_roll = 0.371 * self.W_in
+        h_wing = ((bw_max - c_roll)/2) * math.sin(self.trough)
+        area_trap = (c_roll * h_wing) + (((bw_max - c_roll)/2) * h_wing)
+        area_sur = (bw_max**2 * math.tan(math.radians(self.mat['sur']))) / 6
+        design_cap = ((area_trap + area_sur)/144 * self.V_fpm * 60 * self.mat['den']) / 2000
+        load_pct = (self.Q / design_cap * 100) if design_cap > 0 else 0
+        bw_act = bw_max * math.sqrt(load_pct/100) if load_pct > 0 else 0
+        edge_act = (self.W_in - bw_act)/2
+        
+        # Lump Check
+        max_allowed_lump = self.W_in / 3 * 25.4
+        is_lump_ok = self.lump_mm <= max_allowed_lump
+        
+        return {"load_pct": load_pct, "edge_act": edge_act, "bw_act": bw_act, "c_roll": c_roll, "bw_max": bw_max, "lump_ok": is_lump_ok, "max_lump": max_allowed_lump}
+
+    def calc_power_tension(self):
+        Wb = 3 + (self.W_in / 4)
+        Wm = (33.3 * self.Q) / self.V_fpm
+        Tac = 200 + (5 * self.W_in) 
+        Ky = 0.035 if self.L < 500 else 0.025
+        Te = self.L * (0.2 + Ky*Wb + 0.015*Wb) + Wm*(self.L*Ky + self.H) + Tac
+        T2 = max(Te * 0.35, 12.5*(Wb+Wm))
+        T1 = Te + T2
+        PIW = T1 / self.W_in
+        HP = (Te * self.V_fpm) / 33000
+        kW = HP * 0.746 / 0.90
+        trac_ratio = T1/T2
+        is_slip = trac_ratio > 3.0 
+        return {"kW": kW, "T1": T1, "T2": T2, "Te": Te, "PIW": PIW, "Wb": Wb, "Wm": Wm, "Slip": is_slip, "Ratio": trac_ratio}
+
+    def calc_components(self, T1, Wm, Wb):
+        spacing = 4.0 if Wm < 100 else 3.0
+        load = (Wb + Wm) * spacing
+        limits = get_idler_limits(self.W_in)
+        series = "E"
+        for s, lim in limits.items():
+            if load < lim:
+                series = s
+                break
+        rec_p = get_min_pulley(T1/self.W_in)
+        r_min = (1.6 * T1) / Wb * 0.3048 
+        return {"Series": series, "Load": load, "RecPulley": rec_p, "Curve": r_min}
+
+    def calc_construction_data(self, T1, PIW):
+        trough_factor = 3.2 if self.trough_deg == 35 else (4.0 if self.trough_deg == 45 else 2.0)
+        trans_dist_m = (trough_factor * self.W_in) * 0.0254
+        takeup_len_m = self.L * 0.3048 * 0.015 
+        return {"TransDist": trans_dist_m, "TakeupTravel": takeup_len_m}
+
+    def calc_trajectory(self, p_dia_mm):
+        rp = (p_dia_mm/25.4)/12/2
+        r = rp + ((self.W_in*0.1)/12)
+        v_fps = self.V_fpm/60
+        g = 32.17
+        idx = v_fps**2 / (g*r)
+        gamma = 0 if idx>=1 else math.acos(idx)
+        import numpy as np  # hanya lintasan yang butuh array; import engine tetap ringan
+        t = np.linspace(0, 1.5, 80)
+        x = r * math.sin(gamma) + (v_fps*math.cos(gamma)*t)
+        y = r * math.cos(gamma) + (-v_fps*math.sin(gamma)*t) - (0.5*g*t**2)
+        return x*0.3048, y*0.3048, rp*0.3048, idx
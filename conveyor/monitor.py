@@ -0,0 +1,336 @@
+"""Monitor operasional: evaluasi live TPH belt scale per conveyor (streaming).
+
+    python -m conveyor.monitor inventory.csv --tail belt_scale.log
+    python -m conveyor.monitor inventory.csv --tail - < replay.csv             # stdin
+    python -m conveyor.monitor inventory.csv --listen 127.0.0.1:9009          # socket TCP lokal
+    python -m conveyor.monitor inventory.csv --tail scale.log --from-start --no-follow --events ev.jsonl
+
+Inventori (CSV): conveyor_id/tag, material, width, speed, length, lift, trough (default
+35), lump (default 0). Record stream: satu baris per sampel "timestamp,conveyor_id,tph"
+(timestamp epoch detik atau ISO 8601) atau JSON {"ts", "conveyor_id", "tph"}.
+
+Suku statis tiap conveyor (kapasitas desain, Wb, suku gesekan & lift) dihitung sekali
+lewat BatchEngine. Karena load %, Te dan kW linear terhadap TPH, nilai rolling cukup
+dihitung dari rata-rata TPH di window (running sum) dan peak (deque monoton): update
+per sampel O(1) amortized. Event overload (peak load > 100%), spill (rata-rata load
+> 85%) dan slip (traction ratio > 3) ditulis sebagai JSON saat mulai & selesai.
+
+Sampel dengan ts/tph bukan angka hingga (nan/inf) dan sampel yang datang terlambat
+(ts lebih tua dari sampel terakhir conveyor yang sama) dibuang dan dihitung sebagai
+"ditolak"; window hanya bergerak maju.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import signal
+import sys
+import time
+from collections import deque
+from datetime import datetime
+
+import numpy as np
+
+from .engine import get_materials
+from .batch import BatchEngine
+from .common import KW_FACTOR, read_rows
+
+INVENTORY_COLUMNS = ["width", "speed", "length", "lift", "trough", "lump"]
+WINDOW_S = 10.0
+OVERLOAD_PCT = 100
+SPILL_PCT = 85
+SLIP_RATIO = 3.0
+HYSTERESIS = 0.02          # event selesai bila nilai turun 2% di bawah ambang
+RESUM_EVERY = 65536        # hitung ulang running sum secara periodik (drift floating point)
+
+
+# --- INVENTORI & SUKU STATIS ---
+def read_inventory(fh, mat_db=None):
+    """List dict conveyor dari CSV inventori (file-like text); ValueError dengan nomor baris bila tidak valid."""
+    return [{"conveyor_id": cid, **row} for cid, row in read_rows(fh, INVENTORY_COLUMNS, mat_db or get_materials(), ("conveyor_id", "tag"))]
+
+
+def static_terms(conveyors, mat_db=None):
+    """Suku statis semua conveyor sekaligus (vectorized). Return dict array per suku.
+
+    load % = tph * inv_cap          (inv_cap = 100 / TPH pada load 100%)
+    Te     = te0 + te1 * tph        (lbs; te0 = suku belt kosong + Tac, te1 = gesekan & lift material)
+    Wm     = wm1 * tph
+    kW     = kw_te * Te
+    """
+    mat_db = mat_db or get_materials()
+    unknown = {c["material"] for c in conveyors} - set(mat_db)
+    if unknown:
+        raise ValueError(f"material tidak dikenal: {', '.join(sorted(unknown))}")
+    col = lambda k: np.array([c[k] for c in conveyors])
+    eng = BatchEngine(col("material"), 1.0, col("width"), col("speed"), col("length"), col("lift"), col("trough"), col("lump"), mat_db=mat_db)
+    cap100 = eng.calc_geometry()["design_cap"] / 1.1023
+    Wb = 3 + (eng.W_in / 4)
+    Tac = 200 + (5 * eng.W_in)
+    Ky = np.where(eng.L < 500, 0.035, 0.025)
+    wm1 = 33.3 * 1.1023 / eng.V_fpm
+    return {"inv_cap": np.where(cap100 > 0, 100 / cap100, np.inf), "Wb": Wb, "wm1": wm1,
+            "te0": eng.L * (0.2 + Ky*Wb + 0.015*Wb) + Tac, "te1": wm1 * (eng.L*Ky + eng.H), "kw_te": KW_FACTOR * eng.V_fpm}
+
+
+class ConveyorState:
+    """Rolling window satu conveyor. update() O(1) amortized."""
+
+    __slots__ = ("cid", "inv_cap", "Wb", "wm1", "te0", "te1", "kw_te", "window", "q", "peak", "total", "n", "updates",
+                 "last_ts", "active", "load", "peak_load", "kW", "ratio", "tph")
+
+    def __init__(self, cid, terms, window=WINDOW_S):
+        if not window > 0:
+            raise ValueError(f"window harus > 0 detik: {window}")
+        self.cid = cid
+        for k in ("inv_cap", "Wb", "wm1", "te0", "te1", "kw_te"):
+            setattr(self, k, float(terms[k]))
+        self.window = window
+        self.q = deque()        # (ts, tph) dalam window
+        self.peak = deque()     # deque monoton turun untuk max TPH di window
+        self.total = 0.0
+        self.n = self.updates = 0
+        self.last_ts = None
+        self.active = {"overload": False, "spill": False, "slip": False}
+        self.load = self.peak_load = self.kW = self.ratio = self.tph = 0.0
+
+    def update(self, ts, tph):
+        """Tambah satu sampel; return list event (biasanya kosong)."""
+        q, peak = self.q, self.peak
+        q.append((ts, tph)); self.total += tph
+        while peak and peak[-1][1] <= tph:
+            peak.pop()
+        peak.append((ts, tph))
+        start = ts - self.window
+        while q[0][0] <= start:
+            self.total -= q.popleft()[1]
+        while peak[0][0] <= start:
+            peak.popleft()
+        self.n += 1; self.updates += 1
+        if self.updates % RESUM_EVERY == 0:
+            self.total = sum(v for _, v in q)
+        self.last_ts = ts
+
+        mean = self.total / len(q)
+        Te = self.te0 + self.te1 * mean
+        T2 = max(Te * 0.35, 12.5 * (self.Wb + self.wm1 * mean))
+        self.tph = mean
+        self.load = mean * self.inv_cap
+        self.peak_load = peak[0][1] * self.inv_cap
+        self.kW = self.kw_te * Te
+        self.ratio = (Te + T2) / T2
+
+        events = None
+        for name, value, limit in (("overload", self.peak_load, OVERLOAD_PCT), ("spill", self.load, SPILL_PCT), ("slip", self.ratio, SLIP_RATIO)):
+            on = self.active[name]
+            if (not on and value > limit) or (on and value < limit * (1 - HYSTERESIS)):
+                self.active[name] = not on
+                events = events or []
+                events.append({"ts": ts, "conveyor_id": self.cid, "event": name, "state": "start" if not on else "end", "value": round(value, 3)})
+        return events
+
+    def snapshot(self):
+        return {"conveyor_id": self.cid, "samples": self.n, "last_ts": self.last_ts, "tph_mean": self.tph, "load_pct": self.load,
+                "peak_load_pct": self.peak_load, "kW": self.kW, "ratio": self.ratio, "active": [k for k, v in self.active.items() if v]}
+
+
+# --- MONITOR ---
+def _parse_ts(s):
+    try:
+        return float(s)
+    except ValueError:
+        return datetime.fromisoformat(s.replace("Z", "+00:00")).timestamp()
+
+
+class Monitor:
+    def __init__(self, conveyors, window=WINDOW_S, mat_db=None, on_event=None):
+        terms = static_terms(conveyors, mat_db)
+        self.states = {c["conveyor_id"]: ConveyorState(c["conveyor_id"], {k: v[i] for k, v in terms.items()}, window)
+                       for i, c in enumerate(conveyors)}
+        self.on_event = on_event
+        self.samples = self.rejected = self.late = 0
+        self.unknown = set()
+
+    def process(self, ts, cid, tph):
+        st = self.states.get(cid)
+        if st is None:
+            self.unknown.add(cid)
+            self.rejected += 1
+            return
+        if st.last_ts is not None and ts < st.last_ts:
+            self.late += 1
+            self.rejected += 1
+            return
+        self.samples += 1
+        events = st.update(ts, tph)
+        if events and self.on_event:
+            for e in events:
+                self.on_event(e)
+
+    def process_line(self, line):
+        """Satu record "ts,conveyor_id,tph" atau JSON; baris kosong / header / rusak diabaikan."""
+        line = line.strip()
+        if not line:
+            return
+        try:
+            if line[0] == "{":
+                rec = json.loads(line)
+                ts, cid, tph = rec["ts"], str(rec["conveyor_id"]), float(rec["tph"])
+                ts = ts if isinstance(ts, (int, float)) else _parse_ts(ts)
+            else:
+                ts, cid, tph = line.split(",", 2)
+                ts, cid, tph = _parse_ts(ts), cid.strip(), float(tph)
+        except (ValueError, KeyError, TypeError):
+            self.rejected += 1
+            return
+        if not (math.isfinite(ts) and math.isfinite(tph)):
+            self.rejected += 1
+            return
+        self.process(ts, cid, tph)
+
+    def snapshot(self):
+        return [s.snapshot() for s in self.states.values() if s.n]
+
+
+# --- SUMBER STREAM ---
+def follow(path, from_start=False, follow=True, poll=0.2):
+    """Generator baris dari file (seperti tail -F); '-' = stdin. Tangani file dirotasi/terpotong.
+
+    Saat file diam, yield "" tiap `poll` detik agar pemanggil tetap bisa menjalankan
+    tugas periodik (status, flush) berdasarkan waktu.
+    """
+    if path == "-":
+        yield from sys.stdin
+        return
+    fh = open(path, "r")
+    try:
+        if not from_start:
+            fh.seek(0, os.SEEK_END)
+        buf = ""
+        while True:
+            chunk = fh.readline()
+            if chunk:
+                buf += chunk
+                if buf.endswith("\n"):
+                    yield buf
+                    buf = ""
+                continue
+            if not follow:
+                if buf:
+                    yield buf
+                return
+            try:
+                st = os.stat(path)
+                if st.st_ino != os.fstat(fh.fileno()).st_ino or st.st_size < fh.tell():
+                    fh.close()
+                    fh = open(path, "r")
+                    continue
+            except FileNotFoundError:
+                pass
+            time.sleep(poll)
+            yield ""
+    finally:
+        fh.close()
+
+
+async def listen(monitor, host, port, status=None, every=5.0):
+    """Terima record dari banyak client TCP lokal (satu record per baris)."""
+    async def client(reader, writer):
+        try:
+            async for line in reader:
+                monitor.process_line(line.decode("utf-8", "replace"))
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(client, host, port)
+    print(f"monitor mendengarkan di {host}:{port}", file=sys.stderr, flush=True)
+    async with server:
+        while True:
+            await asyncio.sleep(every)
+            if status:
+                status()
+
+
+def _positive(s):
+    v = float(s)
+    if not v > 0:
+        raise argparse.ArgumentTypeError(f"harus > 0: {s}")
+    return v
+
+
+def _terminate(signum, frame):
+    raise KeyboardInterrupt
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m conveyor.monitor", description="Monitor streaming TPH belt scale per conveyor.")
+    ap.add_argument("inventory", help="CSV inventori conveyor")
+    src = ap.add_mutually_exclusive_group(required=True)
+    src.add_argument("--tail", metavar="FILE", help="ikuti file log belt scale ('-' = stdin)")
+    src.add_argument("--listen", metavar="HOST:PORT", help="terima record lewat socket TCP lokal")
+    ap.add_argument("--from-start", action="store_true", help="baca file dari awal (default: hanya data baru)")
+    ap.add_argument("--no-follow", action="store_true", help="berhenti di akhir file (replay)")
+    ap.add_argument("--window", type=_positive, default=WINDOW_S, help=f"panjang rolling window detik (default {WINDOW_S:g})")
+    ap.add_argument("--events", default="-", help="output event JSON lines (default stdout)")
+    ap.add_argument("--status", help="tulis snapshot semua conveyor (JSON) ke file ini secara periodik")
+    ap.add_argument("--status-every", type=float, default=5.0, help="interval snapshot & statistik (detik)")
+    args = ap.parse_args(argv)
+
+    try:
+        with open(args.inventory, newline="") as fh:
+            conveyors = read_inventory(fh)
+        out = sys.stdout if args.events == "-" else open(args.events, "a", buffering=1)
+
+        def emit(e):
+            out.write(json.dumps(e) + "\n")
+            out.flush()     # event jarang; langsung terlihat oleh pembaca file/pipe
+        monitor = Monitor(conveyors, args.window, on_event=emit)
+    except (KeyError, ValueError, OSError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    t0 = last = time.perf_counter()
+    last_n = 0
+    signal.signal(signal.SIGTERM, _terminate)    # SIGTERM ditutup rapi seperti Ctrl+C
+
+    def status():
+        nonlocal last, last_n
+        now = time.perf_counter()
+        rate = (monitor.samples - last_n) / max(now - last, 1e-9)
+        last, last_n = now, monitor.samples
+        out.flush()
+        active = sum(1 for s in monitor.states.values() if any(s.active.values()))
+        print(f"{monitor.samples:,} sampel | {rate:,.0f} sampel/s | {active} conveyor dengan event aktif | {monitor.rejected:,} ditolak ({monitor.late:,} terlambat)", file=sys.stderr, flush=True)
+        if args.status:
+            tmp = f"{args.status}.tmp"
+            with open(tmp, "w") as fh:
+                json.dump(monitor.snapshot(), fh)
+            os.replace(tmp, args.status)
+
+    try:
+        if args.listen:
+            host, _, port = args.listen.rpartition(":")
+            asyncio.run(listen(monitor, host or "127.0.0.1", int(port), status, args.status_every))
+        else:
+            for n, line in enumerate(follow(args.tail, args.from_start, not args.no_follow)):
+                monitor.process_line(line)
+                if (not line or n % 4096 == 0) and time.perf_counter() - last >= args.status_every:
+                    status()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        elapsed = time.perf_counter() - t0
+        out.flush()
+        if monitor.unknown:
+            print(f"conveyor_id tidak ada di inventori: {', '.join(sorted(map(str, monitor.unknown))[:20])}", file=sys.stderr)
+        print(f"{monitor.samples:,} sampel diproses dalam {elapsed:.2f} s ({monitor.samples / max(elapsed, 1e-9):,.0f} sampel/s)", file=sys.stderr)
+        if args.status:
+            status()
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
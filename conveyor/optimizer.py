@@ -0,0 +1,103 @@
+import multiprocessing
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+
+from .batch import BatchEngine
+from .common import cpu_count
+
+# --- DESIGN OPTIMIZER ---
+# Sweep lebar x kecepatan x sudut trough (x material) lewat BatchEngine, per chunk.
+# Chunk kecil dievaluasi in-process (vectorized sudah cukup cepat); sweep besar
+# dibagi ke process pool.
+
+STD_WIDTHS = [500, 650, 800, 1000, 1200, 1400, 1600, 1800, 2000]
+STD_TROUGHS = [20, 35, 45]
+SPEED_GRID = np.round(np.arange(0.5, 6.0 + 1e-9, 0.1), 2)
+SERIES_RANK = {"B": 0, "C": 1, "D": 2, "E": 3}
+MAX_FILL = 85
+CHUNK_SIZE = 20000
+POOL_MIN_ROWS = 1_000_000
+
+GRID_KEYS = ["material", "width", "speed", "trough"]
+RESULT_KEYS = ["load_pct", "kW", "T1", "PIW", "Ratio", "Slip", "lump_ok", "Series", "RecPulley", "feasible"]
+
+
+def design_grid(materials, widths=STD_WIDTHS, speeds=SPEED_GRID, troughs=STD_TROUGHS):
+    m, w, v, t = np.meshgrid(np.asarray(materials), np.asarray(widths, dtype=float), np.asarray(speeds, dtype=float), np.asarray(troughs, dtype=float), indexing='ij')
+    return {"material": m.ravel(), "width": w.ravel(), "speed": v.ravel(), "trough": t.ravel()}
+
+
+def evaluate_chunk(grid, cap, length, lift, lump):
+    res = BatchEngine(grid["material"], cap, grid["width"], grid["speed"], length, lift, grid["trough"], lump).run()
+    # Slip bukan syarat mutlak (diatasi dengan counterweight), hanya kunci ranking.
+    res["feasible"] = (res["load_pct"] > 0) & (res["load_pct"] <= MAX_FILL) & res["lump_ok"]
+    return {**grid, **{k: res[k] for k in RESULT_KEYS}}
+
+
+def merge(chunks):
+    chunks = list(chunks)
+    if not chunks:
+        return {k: np.array([]) for k in GRID_KEYS + RESULT_KEYS}
+    return {k: np.concatenate([c[k] for c in chunks]) for k in chunks[0]}
+
+
+def sweep(cap, length, lift, lump, materials, widths=STD_WIDTHS, speeds=SPEED_GRID, troughs=STD_TROUGHS, chunk_size=CHUNK_SIZE, workers=None):
+    """Generator: yield (baris selesai, total baris, hasil chunk) agar UI bisa streaming progress."""
+    grid = design_grid(materials, widths, speeds, troughs)
+    n = len(grid["material"])
+    args = [({k: v[i:i + chunk_size] for k, v in grid.items()}, cap, length, lift, lump) for i in range(0, n, chunk_size)]
+    if workers is None:
+        workers = cpu_count() if n >= POOL_MIN_ROWS else 1
+    done = 0
+    if workers > 1 and len(args) > 1:
+        # spawn: aman dipanggil dari thread server Streamlit
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as ex:
+            for fut in as_completed([ex.submit(evaluate_chunk, *a) for a in args]):
+                part = fut.result()
+                done += len(part["material"])
+                yield done, n, part
+    else:
+        for a in args:
+            part = evaluate_chunk(*a)
+            done += len(part["material"])
+            yield done, n, part
+
+
+def rank(results, feasible_only=True):
+    """Urutkan desain: tanpa slip dulu, lalu kW, PIW, dan kelas idler (B terbaik)."""
+    if feasible_only:
+        results = {k: v[results["feasible"]] for k, v in results.items()}
+    names, inv = np.unique(results["Series"], return_inverse=True)
+    series_rank = np.array([SERIES_RANK[s] for s in names], dtype=int)[inv]
+    order = np.lexsort((series_rank, results["PIW"], results["kW"], results["Slip"]))
+    return {k: v[order] for k, v in results.items()}
+
+
+def pareto_mask(results, keys=("kW", "PIW", "load_pct")):
+    """Mask desain non-dominated untuk 3 objektif (semua diminimalkan).
+
+    Sweep urut objektif pertama sambil menyimpan "tangga" 2D (objektif 2 & 3) dari
+    titik yang sudah diproses: O(n log n), cukup untuk sweep jutaan baris.
+    """
+    k1, k2, k3 = [np.asarray(results[k], dtype=float).ravel() for k in keys]
+    order = np.lexsort((k3, k2, k1))
+    mask = np.zeros(len(k1), dtype=bool)
+    stair_x, stair_y = [], []  # x naik, y turun
+    for i, x, y in zip(order.tolist(), k2[order].tolist(), k3[order].tolist()):
+        j = bisect_right(stair_x, x)
+        if j and stair_y[j - 1] <= y:
+            continue
+        mask[i] = True
+        end = j
+        while end < len(stair_x) and stair_y[end] >= y:
+            end += 1
+        stair_x[j:end] = [x]
+        stair_y[j:end] = [y]
+    return mask
+
+
+def optimize(cap, length, lift, lump, materials, **kwargs):
+    """Sweep penuh (blocking): hasil feasible terurut + mask Pareto-nya."""
+    ranked = rank(merge(part for _, _, part in sweep(cap, length, lift, lump, materials, **kwargs)))
+    return ranked, pareto_mask(ranked)
@@ -0,0 +1,173 @@
+"""Instrumentasi ringan: timing span per rerun + log JSON untuk agregasi latency.
+
+    CONVEYOR_PERF_LOG=/var/log/petrostream/perf.jsonl streamlit run main_app.py
+    python -m conveyor.perf /var/log/petrostream/perf.jsonl      # p50/p90/p99 per span
+
+Span dicatat ke trace rerun yang aktif (contextvar, jadi aman untuk banyak sesi
+Streamlit paralel) dan, bila CONVEYOR_PERF_LOG di-set, ditulis satu baris JSON per
+span. Span di luar rerun (mis. PDF deferred saat tombol download diklik) tetap
+masuk log sebagai span tanpa run_id.
+"""
+import argparse
+import contextvars
+import json
+import logging
+import os
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+try:
+    import resource
+except ImportError:   # Windows
+    resource = None
+
+LOG_PATH = os.environ.get("CONVEYOR_PERF_LOG")
+PERCENTILES = [50, 90, 99]
+
+_current = contextvars.ContextVar("conveyor_trace", default=None)
+_logger = None
+
+
+def _get_logger():
+    global _logger
+    if _logger is None and LOG_PATH:
+        from logging.handlers import WatchedFileHandler
+        _logger = logging.getLogger("conveyor.perf")
+        _logger.setLevel(logging.INFO)
+        _logger.propagate = False
+        handler = WatchedFileHandler(LOG_PATH)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        _logger.addHandler(handler)
+    return _logger
+
+
+def _emit(record):
+    log = _get_logger()
+    if log is not None:
+        log.info(json.dumps(record, separators=(",", ":")))
+
+
+def memory_kb():
+    """(RSS sekarang, peak RSS proses) dalam KB; None bila tidak tersedia di OS ini."""
+    rss = peak = None
+    try:
+        with open("/proc/self/statm") as fh:
+            rss = int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == "darwin":
+            peak //= 1024
+    return rss, peak
+
+
+class Trace:
+    """Kumpulan span satu rerun halaman."""
+
+    def __init__(self, session=None):
+        self.session = session
+        self.run_id = uuid.uuid4().hex[:12]
+        self.spans = []
+        self.t0 = time.perf_counter()
+        self.rss0, self.peak0 = memory_kb()
+        self.total_ms = None
+
+    def add(self, name, start, ms, status):
+        self.spans.append({"span": name, "start_ms": (start - self.t0) * 1000, "ms": ms, "status": status})
+
+    def finish(self):
+        self.total_ms = (time.perf_counter() - self.t0) * 1000
+        self.rss1, self.peak1 = memory_kb()
+        return self
+
+    def memory(self):
+        """Ringkasan memori (KB): RSS awal/akhir rerun, peak RSS proses, kenaikan peak proses sejak awal rerun.
+
+        ru_maxrss berlaku untuk seluruh proses, jadi kenaikan peak bisa berasal dari sesi
+        lain yang berjalan bersamaan; bukan murni alokasi rerun ini.
+        """
+        grow = self.peak1 - self.peak0 if self.peak0 is not None else None
+        return {"rss_start_kb": self.rss0, "rss_end_kb": self.rss1, "peak_rss_kb": self.peak1, "peak_growth_kb": grow}
+
+
+@contextmanager
+def span(name):
+    """Ukur blok kode; hasil masuk trace aktif dan log (bila aktif)."""
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        yield
+    except BaseException as e:
+        # Streamlit memakai exception (RerunException/StopException) untuk kontrol alur.
+        status = type(e).__name__
+        raise
+    finally:
+        ms = (time.perf_counter() - start) * 1000
+        trace = _current.get()
+        if trace is not None:
+            trace.add(name, start, ms, status)
+        _emit({"ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"), "span": name, "ms": round(ms, 3), "status": status,
+               "session": trace.session if trace else None, "run_id": trace.run_id if trace else None})
+
+
+def start_trace(session=None):
+    trace = Trace(session)
+    _current.set(trace)
+    return trace
+
+
+def end_trace(trace):
+    """Tutup trace rerun, tulis span total ("rerun") beserta memori ke log."""
+    trace.finish()
+    _current.set(None)
+    _emit({"ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"), "span": "rerun", "ms": round(trace.total_ms, 3), "status": "ok",
+           "session": trace.session, "run_id": trace.run_id, **trace.memory()})
+    return trace
+
+
+# --- AGREGASI LOG ---
+def summarize(lines):
+    """Persentil latency per span dari baris log JSON. Return list dict terurut total waktu."""
+    import numpy as np
+    per_span = {}
+    for line in lines:
+        try:
+            rec = json.loads(line)
+            if not isinstance(rec, dict):
+                continue
+            ms = float(rec.get("ms", 0))
+        except (ValueError, TypeError):
+            continue
+        per_span.setdefault(rec.get("span"), []).append(ms)
+    rows = []
+    for name, ms in per_span.items():
+        ms = np.asarray(ms)
+        q = np.percentile(ms, PERCENTILES)
+        rows.append({"span": name, "count": len(ms), **{f"p{p}_ms": float(v) for p, v in zip(PERCENTILES, q)},
+                     "max_ms": float(ms.max()), "total_s": float(ms.sum() / 1000)})
+    return sorted(rows, key=lambda r: -r["total_s"])
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m conveyor.perf", description="Persentil latency dari log perf JSON.")
+    ap.add_argument("log", help="file log (CONVEYOR_PERF_LOG)")
+    args = ap.parse_args(argv)
+    try:
+        with open(args.log) as fh:
+            rows = summarize(fh)
+    except OSError as e:
+        print(f"error: {e!r}", file=sys.stderr)
+        return 2
+    cols = ["count"] + [f"p{p}_ms" for p in PERCENTILES] + ["max_ms", "total_s"]
+    print(f"{'span':<32}" + "".join(f"{c:>12}" for c in cols))
+    for r in rows:
+        print(f"{str(r['span']):<32}" + "".join(f"{r[c]:>12}" if c == "count" else f"{r[c]:>12.2f}" for c in cols))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+import io
+import math
+from functools import lru_cache
+
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.patches import Polygon, Circle
+
+from .trajectory import chute_outline
+
+# --- FIGURE RENDERING ---
+# Figure dibuat langsung (bukan lewat pyplot), jadi tidak terdaftar di figure manager
+# global: tidak perlu plt.close(), aman dipakai paralel dari thread sesi Streamlit, dan
+# langsung dibuang GC setelah dirender ke bytes PNG/SVG.
+
+DPI = 150
+# Kompresi zlib default (6) memakan sebagian besar waktu render; level 1 ~3x lebih
+# cepat dengan ukuran PNG sedikit lebih besar (gambar hanya dikirim ke browser).
+PNG_COMPRESS = 1
+
+
+def fig_bytes(fig, fmt="png", dpi=DPI):
+    buf = io.BytesIO()
+    extra = {"pil_kwargs": {"compress_level": PNG_COMPRESS}} if fmt == "png" else {}
+    fig.savefig(buf, format=fmt, dpi=dpi, bbox_inches='tight', **extra)
+    return buf.getvalue()
+
+
+# Geometri polygon di-cache per input (hanya bergantung pada ukuran belt & material).
+@lru_cache(maxsize=512)
+def belt_outline(W_in, c_roll, trough_deg):
+    wr = (W_in - c_roll)/2; beta = math.radians(trough_deg)
+    return np.array([(-c_roll/2 - wr*math.cos(beta), wr*math.sin(beta)), (-c_roll/2, 0), (c_roll/2, 0), (c_roll/2 + wr*math.cos(beta), wr*math.sin(beta))])
+
+
+@lru_cache(maxsize=512)
+def material_outline(c_roll, bw_max, trough_deg, sur_deg, fill):
+    """Polygon penampang material + tinggi tepi (yr) untuk posisi lump."""
+    beta = math.radians(trough_deg)
+    scale = math.sqrt(min(fill, 120)/100)
+    bw_viz = bw_max * scale
+    wf = max(0, (bw_viz/2 - c_roll/2))
+    xr = (c_roll/2) + wf*math.cos(beta); yr = wf*math.sin(beta)
+    xl = -xr; yp = yr + (xr * math.tan(math.radians(sur_deg)))
+    xc = np.linspace(xl, xr, 50); a = (yr - yp)/(xr**2) if xr>0 else 0; yc = a*xc**2 + yp
+    base = [(xr, yr), (c_roll/2, 0), (-c_roll/2, 0), (xl, yr)] if wf>0 else [(xr, 0), (xl, 0)]
+    return np.vstack([np.column_stack([xc, yc]), base]), yr
+
+
+def cross_section(W_in, c_roll, bw_max, trough_deg, sur_deg, fill, lump_mm, fmt="png"):
+    fig = Figure(figsize=(10, 3.5))
+    ax = fig.add_subplot()
+    ax.add_patch(Polygon(belt_outline(W_in, c_roll, trough_deg), closed=False, linewidth=5, edgecolor='#2c3e50', facecolor='none'))
+    if fill > 0:
+        poly, yr = material_outline(c_roll, bw_max, trough_deg, sur_deg, fill)
+        col = '#2ecc71' if fill <= 85 else '#e74c3c'
+        ax.add_patch(Polygon(poly, closed=True, facecolor=col, alpha=0.8))
+        ax.add_patch(Circle((0, yr/2), lump_mm/25.4/2, color='#9b59b6', alpha=0.6, label='Max Lump'))
+    ax.set_xlim(-W_in/1.5, W_in/1.5); ax.set_ylim(-1, W_in/1.8); ax.set_aspect('equal'); ax.axis('off')
+    return fig_bytes(fig, fmt)
+
+
+def trajectory(xt, yt, rp, idx, chute_w, chute_h, hood_h, streams=(), impacts=(), fmt="png"):
+    """streams: [(x, y, label)] stream tambahan (upper/lower); impacts: [(x, y)] titik impact."""
+    fig = Figure(figsize=(8, 5))
+    ax = fig.add_subplot()
+    ax.add_patch(Circle((0, -rp), rp, color='#95a5a6', alpha=0.5))
+    ax.plot([-2, 0], [-rp + rp, 0], 'k-', linewidth=4)
+    ax.plot(xt, yt, 'b-', linewidth=2, alpha=0.6, label='Flow Stream')
+    for (sx, sy, label), ls in zip(streams, [':', '--', '-.']):
+        ax.plot(sx, sy, color='#2980b9', linestyle=ls, linewidth=1.2, alpha=0.8, label=label)
+    chute_points, impact_wall_x = chute_outline(rp, float(np.max(xt)), chute_w, chute_h, hood_h)
+    ax.add_patch(Polygon(chute_points, closed=False, edgecolor='#e67e22', linewidth=3, facecolor='none', linestyle='--', label='Chute Box'))
+    ax.plot([impact_wall_x, impact_wall_x], [rp, -chute_h], color='#d35400', linewidth=5, alpha=0.5, label='Impact Wall')
+    for i, (ix, iy) in enumerate(impacts):
+        ax.plot(ix, iy, 'rX', markersize=10, label='Impact Point' if i == 0 else None)
+    ax.set_title(f"Trajectory Index: {idx:.2f} ({'High Speed/Tangent' if idx>=1 else 'Low Speed/Wrap'})")
+    ax.grid(True, alpha=0.3); ax.legend(loc='upper left')
+    ax.set_ylim(-chute_h - 0.5, rp + hood_h + 0.5); ax.set_xlim(-1.0, impact_wall_x + 1.0); ax.set_aspect('equal')
+    return fig_bytes(fig, fmt)
+
+
+def trajectory_envelope(xg, lo, hi, chute_pts, imp_x, imp_y, imp_speed, fmt="png"):
+    """Envelope semua lintasan (speed x pulley x upper/lower) + sebaran titik impact."""
+    fig = Figure(figsize=(8, 5))
+    ax = fig.add_subplot()
+    ax.fill_between(xg, lo, hi, color='#3498db', alpha=0.25, label='Envelope Material')
+    ax.plot(xg, hi, color='#2980b9', linewidth=1); ax.plot(xg, lo, color='#2980b9', linewidth=1)
+    ax.add_patch(Polygon(chute_pts, closed=False, edgecolor='#e67e22', linewidth=3, facecolor='none', linestyle='--', label='Chute Box'))
+    sc = ax.scatter(imp_x, imp_y, c=imp_speed, cmap='plasma', s=14, zorder=3, label='Impact Points')
+    fig.colorbar(sc, ax=ax, label="Belt Speed (m/s)")
+    ax.set_title("Envelope Trajectory & Titik Impact")
+    ax.grid(True, alpha=0.3); ax.legend(loc='upper right')
+    ax.set_xlim(chute_pts[:, 0].min() - 0.5, chute_pts[:, 0].max() + 0.5); ax.set_ylim(chute_pts[:, 1].min() - 0.5, chute_pts[:, 1].max() + 0.5)
+    ax.set_aspect('equal')
+    return fig_bytes(fig, fmt)
+
+
+def tension_envelope(x, z, T_carry, T_return, fmt="png"):
+    fig = Figure(figsize=(8, 3.5))
+    ax = fig.add_subplot()
+    ax.plot(x, T_carry, 'r-', linewidth=2, label='Carrying')
+    ax.plot(x, T_return, 'b-', linewidth=2, label='Return')
+    ax.fill_between(x, T_return, T_carry, alpha=0.1, color='red')
+    ax.plot([x[0], x[-1]], [T_carry[0], T_carry[-1]], 'ro')
+    ax.plot([x[-1]], [T_return[-1]], 'bo')
+    ax.set_ylabel("Tension (lbs)"); ax.set_xlabel("Conveyor Length (m)")
+    ax.set_title("Profil Tegangan Belt")
+    ax.grid(True, alpha=0.3)
+    ax2 = ax.twinx()
+    ax2.fill_between(x, z.min(), z, color='#95a5a6', alpha=0.15, linewidth=0)
+    ax2.plot(x, z, color='#7f8c8d', linewidth=1, label='Elevasi')
+    ax2.set_ylabel("Elevasi (m)")
+    ax.set_zorder(ax2.get_zorder() + 1); ax.patch.set_visible(False)
+    h1, l1 = ax.get_legend_handles_labels(); h2, l2 = ax2.get_legend_handles_labels()
+    ax.legend(h1 + h2, l1 + l2, loc='upper left')
+    return fig_bytes(fig, fmt)
+
+
+def uncertainty_hist(load_hist, kW_hist, kW_p95, spill_pct=85, overload_pct=100, fmt="png"):
+    """Histogram Monte Carlo (counts, edges) untuk load % dan kW."""
+    fig = Figure(figsize=(10, 3.5))
+    ax1, ax2 = fig.subplots(1, 2)
+    counts, edges = load_hist
+    cols = np.where(edges[:-1] >= overload_pct, '#e74c3c', np.where(edges[:-1] >= spill_pct, '#f39c12', '#2ecc71'))
+    ax1.bar(edges[:-1], counts, width=np.diff(edges), align='edge', color=cols)
+    ax1.axvline(spill_pct, color='#f39c12', linestyle='--', label=f'Spill {spill_pct}%')
+    ax1.axvline(overload_pct, color='#e74c3c', linestyle='--', label=f'Overload {overload_pct}%')
+    ax1.set_xlabel("Volumetric Load (%)"); ax1.set_ylabel("Jumlah Sampel"); ax1.legend(loc='upper left'); ax1.grid(True, alpha=0.3)
+    counts, edges = kW_hist
+    ax2.bar(edges[:-1], counts, width=np.diff(edges), align='edge', color='#3498db')
+    ax2.axvline(kW_p95, color='k', linestyle='--', label=f'P95 {kW_p95:.1f} kW')
+    ax2.set_xlabel("Motor Power (kW)"); ax2.legend(loc='upper left'); ax2.grid(True, alpha=0.3)
+    fig.suptitle("Distribusi Monte Carlo: Load & Power")
+    return fig_bytes(fig, fmt)
+
+
+def capacity_chart(speeds, widths, caps, material, trough, fill, max_v=None, fmt="png"):
+    """Capacity chart gaya CEMA: TPH vs belt speed, satu garis per lebar belt."""
+    fig = Figure(figsize=(8, 5))
+    ax = fig.add_subplot()
+    for w, row in zip(widths, caps):
+        ax.plot(speeds, row, linewidth=1.5, label=f"{int(w)} mm")
+    if max_v:
+        ax.axvline(max_v, color='#c0392b', linestyle='--', label=f'Max Speed {max_v:.2f} m/s')
+    ax.set_yscale('log')
+    ax.set_xlabel("Belt Speed (m/s)"); ax.set_ylabel("Kapasitas (TPH)")
+    ax.set_title(f"Capacity Chart: {material} | Trough {int(trough)}° | Load {fill:g}%")
+    ax.grid(True, which='both', alpha=0.3); ax.legend(loc='lower right', fontsize=8, ncol=2)
+    return fig_bytes(fig, fmt)
+
+
+def pareto_front(kW, PIW, load_pct, front, max_points=5000, fmt="png"):
+    fig = Figure(figsize=(8, 4))
+    ax = fig.add_subplot()
+    step = max(1, len(kW) // max_points)
+    ax.scatter(kW[::step], PIW[::step], s=6, color='#bdc3c7', label='Feasible')
+    sc = ax.scatter(kW[front], PIW[front], c=load_pct[front], cmap='viridis', s=30, edgecolor='k', label='Pareto Front')
+    fig.colorbar(sc, ax=ax, label="Load (%)")
+    ax.set_xlabel("Power (kW)"); ax.set_ylabel("Belt Rating (PIW)")
+    ax.set_title("Pareto Front: Power vs Belt Rating vs Load")
+    ax.grid(True, alpha=0.3); ax.legend(loc='upper right')
+    return fig_bytes(fig, fmt)
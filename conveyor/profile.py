@@ -0,0 +1,101 @@
+import numpy as np
+
+from .engine import TitanEngine
+
+# --- MULTI-SEGMENT PROFILE ENGINE ---
+# Lintasan conveyor = daftar flight lurus (horizontal / incline / decline) dari tail
+# ke head. Tegangan dihitung di ribuan station sepanjang carrying & return side
+# dengan cumsum (tanpa loop per station), memakai rumus Wb/Wm/Ky/Tac yang sama
+# dengan TitanEngine. Untuk satu flight lurus, Te identik dengan calc_power_tension.
+#
+# segment = (L horizontal [m], H beda elevasi [m], R radius kurva vertikal di awal
+# flight [m], 0 = tanpa kurva). Kurva cekung/cembung ditentukan dari perubahan slope.
+
+SAG_FACTOR = 12.5       # T_min = 12.5 x berat per ft (aturan T2 di TitanEngine)
+RETURN_SPACING = 10.0   # ft, jarak return idler
+CURVE_FACTOR = 1.6      # sama dengan faktor radius kurva cekung di calc_components
+
+
+def normalize_segments(segments):
+    """Terima list dict {"L","H","R"} atau tuple (L, H[, R]); buang flight dengan L <= 0."""
+    out = []
+    for s in segments:
+        if isinstance(s, dict):
+            L, H, R = s.get("L", 0), s.get("H", 0), s.get("R", 0)
+        else:
+            L, H, R = (tuple(s) + (0, 0))[:3]
+        L, H, R = float(L or 0), float(H or 0), float(R or 0)
+        if L > 0:
+            out.append((L, H, R))
+    return out
+
+
+class ProfileEngine:
+    def __init__(self, mat_props, cap, w_mm, v_mps, segments, trough_deg=35, lump_mm=0, stations=2000):
+        self.segments = normalize_segments(segments)
+        if not self.segments:
+            raise ValueError("profil conveyor butuh minimal satu segment dengan panjang > 0")
+        seg = np.array(self.segments)
+        self.seg_x = np.concatenate([[0.0], np.cumsum(seg[:, 0])])   # breakpoint horizontal (m)
+        self.seg_z = np.concatenate([[0.0], np.cumsum(seg[:, 1])])   # elevasi breakpoint (m)
+        self.seg_R = seg[:, 2]
+        self.base = TitanEngine(mat_props, cap, w_mm, v_mps, self.seg_x[-1], self.seg_z[-1], trough_deg, lump_mm)
+        self.stations = stations
+
+    def station_grid(self):
+        """Posisi station (m): dibagi proporsional panjang, breakpoint segment selalu ikut."""
+        L_tot = self.seg_x[-1]
+        n = np.maximum(2, np.round(self.stations * np.diff(self.seg_x) / L_tot).astype(int))
+        x = np.concatenate([np.linspace(a, b, k) for a, b, k in zip(self.seg_x[:-1], self.seg_x[1:], n)])
+        x = np.unique(x)
+        return x, np.interp(x, self.seg_x, self.seg_z)
+
+    def calc_tension_profile(self):
+        b = self.base
+        pwr = b.calc_power_tension()
+        Wb, Wm = pwr['Wb'], pwr['Wm']
+        Tac = 200 + (5 * b.W_in)
+        Ky = 0.035 if b.L < 500 else 0.025
+        x, z = self.station_grid()
+        dx = np.diff(x) * 3.281
+        dz = np.diff(z) * 3.281
+
+        # Offset tegangan relatif terhadap T2 (slack side di head), arah gerak belt:
+        # return: head -> tail, lalu Tac di loading point (tail), carrying: tail -> head.
+        ret_step = 0.015*Wb*dx - Wb*dz                      # per interval, arah tail->head
+        ret_off = np.concatenate([np.cumsum(ret_step[::-1])[::-1], [0.0]])
+        car_step = (0.2 + Ky*Wb + Ky*Wm)*dx + (Wb + Wm)*dz
+        car_off = ret_off[0] + Tac + np.concatenate([[0.0], np.cumsum(car_step)])
+        Te = car_off[-1]
+
+        # T2: syarat drive (0.35 Te), aturan TitanEngine, dan sag minimum di semua station.
+        T2 = max(Te * 0.35, SAG_FACTOR*(Wb+Wm), SAG_FACTOR*(Wb+Wm) - car_off.min(), SAG_FACTOR*Wb - ret_off.min())
+        T_carry = T2 + car_off
+        T_return = T2 + ret_off
+        T1 = T_carry[-1]
+
+        spacing = 4.0 if Wm < 100 else 3.0
+        sag_carry = (Wb + Wm) * spacing / (8 * T_carry) * 100
+        sag_return = Wb * RETURN_SPACING / (8 * T_return) * 100
+        HP = (Te * b.V_fpm) / 33000
+        kW = HP * 0.746 / 0.90
+        return {"x": x, "z": z, "T_carry": T_carry, "T_return": T_return, "sag_carry": sag_carry, "sag_return": sag_return,
+                "T1": T1, "T2": T2, "Te": Te, "kW": kW, "Ratio": T1/T2, "Slip": T1/T2 > 3.0, "Wb": Wb, "Wm": Wm,
+                "Takeup": 2 * T_return[0], "curves": self.calc_curves(x, T_carry, Wb)}
+
+    def calc_curves(self, x, T_carry, Wb):
+        """Cek kurva vertikal di transisi antar flight (carrying side)."""
+        seg = np.array(self.segments)
+        slope = seg[:, 1] / seg[:, 0]
+        T_at = np.interp(self.seg_x[1:-1], x, T_carry)
+        curves = []
+        for i, T in enumerate(T_at, start=1):
+            if slope[i] == slope[i - 1]:
+                continue
+            kind = "Concave" if slope[i] > slope[i - 1] else "Convex"
+            # Lift-off hanya relevan di kurva cekung; cembung perlu data modulus belt.
+            r_req = float(CURVE_FACTOR * T / Wb * 0.3048) if kind == "Concave" else None
+            r_act = float(self.seg_R[i]) or None
+            curves.append({"station_m": float(self.seg_x[i]), "kind": kind, "T": float(T), "R_req": r_req, "R": r_act,
+                           "ok": bool(r_req is None or (r_act is not None and r_act >= r_req))})
+        return curves
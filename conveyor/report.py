@@ -0,0 +1,201 @@
+"""Datasheet PDF (FPDF) untuk satu conveyor atau satu daftar proyek.
+
+    python -m conveyor.report project.csv datasheets.zip    # 1 PDF per conveyor, paralel
+    python -m conveyor.report project.csv project.pdf       # 1 PDF gabungan
+
+Kolom CSV proyek: material, cap, width, speed, length, lift, trough (default 35),
+lump (default 0), tag/conveyor_id (opsional, jadi nama file & judul datasheet).
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from fpdf import FPDF
+
+from .engine import get_materials, TitanEngine
+from .common import cpu_count, read_rows
+
+
+# --- PDF REPORT GENERATOR CLASS ---
+class EngineeringReport(FPDF):
+    def header(self):
+        self.set_font('Arial', 'B', 14)
+        self.cell(0, 10, 'BELT CONVEYOR CALCULATION REPORT', 0, 1, 'C')
+        self.set_font('Arial', 'I', 10)
+        self.cell(0, 10, f'Generated on: {datetime.now().strftime("%Y-%m-%d %H:%M")}', 0, 1, 'C')
+        self.line(10, 30, 200, 30)
+        self.ln(10)
+
+    def footer(self):
+        self.set_y(-15)
+        self.set_font('Arial', 'I', 8)
+        self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'C')
+
+    def section_title(self, title):
+        self.set_font('Arial', 'B', 12)
+        self.set_fill_color(230, 230, 230)
+        self.cell(0, 10, title, 0, 1, 'L', True)
+        self.ln(2)
+
+    def data_row(self, label, value):
+        self.set_font('Arial', '', 10)
+        self.cell(90, 8, label, 1)
+        self.cell(0, 8, str(value), 1, 1)
+
+
+def add_datasheet(pdf, design, tag=None):
+    """Tambah satu halaman datasheet. design = (material, cap, w, v, L, H, trough, lump)."""
+    sel_mat, cap, sel_w, sel_v, length, lift, trough, lump = design
+    mat_data = get_materials()[sel_mat]
+    eng = TitanEngine(mat_data, cap, sel_w, sel_v, length, lift, trough, lump)
+    geo = eng.calc_geometry()
+    pwr = eng.calc_power_tension()
+    comp = eng.calc_components(pwr['T1'], pwr['Wm'], pwr['Wb'])
+    pdf.add_page()
+
+    # 1. Design Parameter
+    pdf.section_title("1. DESIGN PARAMETERS")
+    if tag:
+        pdf.data_row("Conveyor Tag", tag)
+    pdf.data_row("Material Name", sel_mat)
+    pdf.data_row("Material Density", f"{mat_data['den']} lbs/ft3")
+    pdf.data_row("Design Capacity", f"{cap} TPH")
+    pdf.data_row("Belt Width", f"{sel_w} mm")
+    pdf.data_row("Belt Speed", f"{sel_v} m/s")
+    pdf.data_row("Conveyor Length", f"{length} m")
+    pdf.data_row("Lift Height", f"{lift} m")
+
+    # 2. Calculated Results
+    pdf.ln(5)
+    pdf.section_title("2. ENGINEERING RESULTS (CEMA)")
+    pdf.data_row("Volumetric Loading", f"{int(geo['load_pct'])} %")
+    pdf.data_row("Motor Power (Shaft)", f"{pwr['kW']:.2f} kW")
+    pdf.data_row("Max Belt Tension (T1)", f"{int(pwr['T1'])} lbs")
+    pdf.data_row("Belt PIW Rating", f"{int(pwr['PIW'])} PIW")
+    pdf.data_row("Idler Load", f"{int(comp['Load'])} lbs")
+    pdf.data_row("Drive Traction Ratio", f"{pwr['Ratio']:.2f}")
+
+    # 3. BOM
+    pdf.ln(5)
+    pdf.section_title("3. BILL OF MATERIALS")
+    pdf.data_row("Recommended Belt", f"EP-{int(pwr['PIW']*1.5)} / Grade {mat_data.get('desc','Gen')}")
+    pdf.data_row("Idler Series", f"CEMA {comp['Series']} / {trough} deg")
+    pdf.data_row("Head Pulley", f"Dia {comp['RecPulley']} mm / Rubber Lagged")
+    pdf.data_row("Motor Spec", f"Cage Motor 4P / {pwr['kW']:.2f} kW")
+    pdf.data_row("Chute Liner", mat_data['liner'])
+    return pdf
+
+
+def _pdf_bytes(pdf):
+    return pdf.output(dest='S').encode('latin-1', 'ignore')
+
+
+def create_pdf(design, tag=None):
+    """Datasheet satu conveyor sebagai bytes PDF."""
+    return _pdf_bytes(add_datasheet(EngineeringReport(), design, tag))
+
+
+def _render_item(item):
+    tag, design = item
+    return tag, create_pdf(design, tag)
+
+
+# --- BATCH REPORT ---
+DESIGN_COLUMNS = ["cap", "width", "speed", "length", "lift", "trough", "lump"]
+
+
+def read_designs(fh, mat_db=None):
+    """Stream (tag, design) dari CSV proyek (file-like text), baris demi baris.
+
+    Baris dengan material tidak dikenal, kolom wajib kosong atau angka tidak valid
+    menghasilkan ValueError yang menyebut nomor barisnya.
+    """
+    for tag, row in read_rows(fh, DESIGN_COLUMNS, mat_db or get_materials()):
+        yield tag, (row["material"], *(row[c] for c in DESIGN_COLUMNS))
+
+
+def iter_datasheets(items, workers=None):
+    """Render datasheet per conveyor, yield (tag, pdf_bytes) berurutan.
+
+    Dengan workers > 1 render dikerjakan process pool; jumlah job yang sedang jalan
+    dibatasi (workers x 4) sehingga memori tidak bergantung pada panjang daftar proyek.
+    """
+    workers = cpu_count() if workers is None else workers
+    if workers <= 1:
+        for item in items:
+            yield _render_item(item)
+        return
+    window = workers * 4
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as ex:
+        pending = deque()
+        for item in items:
+            pending.append(ex.submit(_render_item, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        for fut in pending:
+            yield fut.result()
+
+
+def write_zip(items, fh, workers=None):
+    """Tulis zip berisi satu PDF per conveyor ke file-like fh (streaming). Return jumlah file."""
+    n, seen = 0, set()
+    with zipfile.ZipFile(fh, "w", zipfile.ZIP_DEFLATED) as zf:
+        for tag, data in iter_datasheets(items, workers):
+            name = "".join(c if c.isalnum() or c in "-_." else "_" for c in tag)
+            while name in seen:
+                name += "_"
+            seen.add(name)
+            zf.writestr(f"{name}.pdf", data)
+            n += 1
+    return n
+
+
+def create_combined_pdf(items):
+    """Satu PDF gabungan (FPDF membangun dokumen utuh di memori, jadi tanpa paralel)."""
+    pdf = EngineeringReport()
+    for tag, design in items:
+        add_datasheet(pdf, design, tag)
+    return _pdf_bytes(pdf)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m conveyor.report", description="Batch datasheet PDF untuk daftar conveyor proyek.")
+    ap.add_argument("project", help="CSV daftar conveyor")
+    ap.add_argument("output", help="output .zip (1 PDF per conveyor) atau .pdf (gabungan)")
+    ap.add_argument("-j", "--workers", type=int, default=None, help="jumlah proses render (default: jumlah CPU)")
+    args = ap.parse_args(argv)
+    t0 = time.perf_counter()
+    try:
+        # Semua baris divalidasi dulu (tuple desain kecil), baru dirender.
+        with open(args.project, newline="") as src:
+            items = list(read_designs(src))
+        n = len(items)
+        # Tulis ke file sementara di folder tujuan, rename bila selesai: run gagal tidak meninggalkan output setengah jadi.
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(args.output)), prefix=".report-", suffix=os.path.splitext(args.output)[1])
+        try:
+            with os.fdopen(fd, "wb") as out:
+                if args.output.lower().endswith(".pdf"):
+                    out.write(create_combined_pdf(items))
+                else:
+                    write_zip(items, out, args.workers)
+            os.chmod(tmp, 0o644)
+            os.replace(tmp, args.output)
+        except BaseException:
+            os.remove(tmp)
+            raise
+    except (KeyError, ValueError, OSError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    print(f"{n} datasheet ditulis ke {args.output} ({time.perf_counter() - t0:.2f} s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
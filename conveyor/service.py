@@ -0,0 +1,302 @@
+"""HTTP/JSON service lokal untuk perhitungan conveyor (asyncio, tanpa dependency tambahan).
+
+    python -m conveyor.service --port 8765
+
+Endpoint (body JSON untuk POST, atau query string untuk GET):
+    GET  /health, /materials
+    POST /calc          semua hasil (geometry, power, components, construction)
+    POST /geometry | /power | /components | /construction
+    POST /trajectory    + "pulley_mm" (default 630)
+    POST /report        datasheet PDF (application/pdf)
+
+Field desain: material, cap, width, speed, length, lift, trough (default 35),
+lump (default 0). POST /calc juga menerima list desain. Request yang datang hampir
+bersamaan dikumpulkan jadi micro-batch (maks --batch-size atau --batch-delay-ms) lalu
+dihitung sekaligus lewat BatchEngine; PDF dirender di process pool.
+"""
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit, parse_qsl
+
+import numpy as np
+
+from . import common
+from .engine import get_materials
+from .batch import BatchEngine, BATCH_COLUMNS
+from .trajectory import batch_trajectory
+
+DEFAULTS = {**common.DEFAULTS, "pulley_mm": 630}
+SECTIONS = {
+    "geometry": ["load_pct", "edge_act", "bw_act", "c_roll", "bw_max", "lump_ok", "max_lump"],
+    "power": ["kW", "T1", "T2", "Te", "PIW", "Wb", "Wm", "Slip", "Ratio"],
+    "components": ["Series", "Load", "RecPulley", "Curve"],
+    "construction": ["TransDist", "TakeupTravel"],
+}
+POSITIVE = ("cap", "width", "speed", "length", "pulley_mm")
+NON_NEGATIVE = ("trough", "lump")   # lift boleh negatif (conveyor turun)
+MAX_VALUE = 1e9                     # batas besaran input agar hasil (Q, Te, kW, ...) tetap hingga
+MAX_BATCH = 256
+BATCH_DELAY = 0.002
+MAX_BODY = 1 << 20
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class RequestError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_design(obj, mat_db):
+    """Validasi satu desain (dict) -> tuple urut BATCH_COLUMNS + pulley_mm."""
+    if not isinstance(obj, dict):
+        raise RequestError(400, "desain harus objek JSON")
+    missing = [c for c in BATCH_COLUMNS if c not in obj and c not in DEFAULTS]
+    if missing:
+        raise RequestError(400, f"field wajib tidak ada: {', '.join(missing)}")
+    if not isinstance(obj["material"], str) or obj["material"] not in mat_db:
+        raise RequestError(400, f"material tidak dikenal: {obj['material']!r}")
+    cols = BATCH_COLUMNS[1:] + ["pulley_mm"]
+    try:
+        nums = [float(obj.get(c, DEFAULTS.get(c))) for c in cols]
+    except (TypeError, ValueError) as e:
+        raise RequestError(400, f"nilai numerik tidak valid: {e}") from None
+    for c, v in zip(cols, nums):
+        if not math.isfinite(v):
+            raise RequestError(400, f"{c} harus angka hingga: {v}")
+        if abs(v) > MAX_VALUE:
+            raise RequestError(400, f"{c} di luar rentang (maks {MAX_VALUE:g}): {v:g}")
+        if c in POSITIVE and v <= 0:
+            raise RequestError(400, f"{c} harus > 0: {v:g}")
+        if c in NON_NEGATIVE and v < 0:
+            raise RequestError(400, f"{c} tidak boleh negatif: {v:g}")
+    return (obj["material"], *[int(v) if v.is_integer() else v for v in nums])
+
+
+def evaluate(designs, mat_db=None, trajectory=True):
+    """Hitung banyak desain sekaligus. Return list dict {section: {key: value}}.
+
+    trajectory (bool atau list bool per desain) menentukan baris mana yang juga diberi
+    "trajectory". Baris yang hasilnya NaN/inf diganti RequestError(400).
+    """
+    n = len(designs)
+    cols = list(zip(*designs))
+    res = BatchEngine(np.array(cols[0]), *[np.array(c) for c in cols[1:8]], mat_db=mat_db).run()
+    # satu .tolist() per kolom lalu dict(zip) per section, bukan konversi per elemen
+    per_sec = {sec: [dict(zip(ks, t)) for t in zip(*[res[k].tolist() for k in ks])] for sec, ks in SECTIONS.items()}
+    finite = np.logical_and.reduce([np.isfinite(res[k]) for ks in SECTIONS.values() for k in ks if res[k].dtype.kind == "f"])
+    want = np.broadcast_to(np.asarray(trajectory, dtype=bool), (n,))
+    traj = {}
+    if want.any():
+        sel = np.flatnonzero(want)
+        pulley = [cols[8][i] for i in sel]
+        x, y, rp, idx = batch_trajectory([cols[2][i] for i in sel], [cols[3][i] for i in sel], pulley)
+        finite[sel] &= np.isfinite(x).all(axis=1) & np.isfinite(y).all(axis=1) & np.isfinite(idx)
+        xs, ys, rps, idxs = x.tolist(), y.tolist(), rp.tolist(), idx.tolist()
+        for j, i in enumerate(sel.tolist()):
+            traj[i] = {"pulley_mm": pulley[j], "x": xs[j], "y": ys[j], "rp": rps[j], "idx": idxs[j]}
+    out = []
+    for i in range(n):
+        if not finite[i]:
+            out.append(RequestError(400, "hasil tidak hingga (NaN/inf); periksa besaran input"))
+            continue
+        row = {sec: rows[i] for sec, rows in per_sec.items()}
+        if i in traj:
+            row["trajectory"] = traj[i]
+        out.append(row)
+    return out
+
+
+class MicroBatcher:
+    """Kumpulkan item dari banyak coroutine lalu proses dalam satu panggilan fn(items)."""
+
+    def __init__(self, fn, max_batch=MAX_BATCH, max_delay=BATCH_DELAY):
+        self.fn = fn
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._items = []
+        self._futures = []
+        self._timer = None
+        self.batches = self.items = 0
+
+    def submit(self, item):
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._items.append(item)
+        self._futures.append(fut)
+        if len(self._items) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._flush)
+        return fut
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        items, futures = self._items, self._futures
+        self._items, self._futures = [], []
+        if not items:
+            return
+        self.batches += 1
+        self.items += len(items)
+        try:
+            results = self.fn(items)
+        except Exception as e:
+            for fut in futures:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        for fut, r in zip(futures, results):
+            if not fut.done():
+                if isinstance(r, Exception):
+                    fut.set_exception(r)
+                else:
+                    fut.set_result(r)
+
+
+def _render_pdf(design):
+    from .report import create_pdf
+    return create_pdf(design)
+
+
+class CalcService:
+    def __init__(self, workers=1, max_batch=MAX_BATCH, max_delay=BATCH_DELAY):
+        self.mat_db = get_materials()
+        self.batcher = MicroBatcher(lambda items: evaluate([d for d, _ in items], self.mat_db, [t for _, t in items]), max_batch, max_delay)
+        self.pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+        self.requests = 0
+        self.t0 = time.monotonic()
+
+    async def handle(self, method, path, query, body):
+        """Route satu request. Return (status, content_type, payload bytes)."""
+        self.requests += 1
+        route = path.rstrip("/") or "/"
+        if route == "/health":
+            return self._json({"status": "ok", "requests": self.requests, "batches": self.batcher.batches,
+                               "mean_batch": self.batcher.items / self.batcher.batches if self.batcher.batches else 0.0,
+                               "uptime_s": time.monotonic() - self.t0})
+        if route == "/materials":
+            return self._json(self.mat_db)
+        section = route.lstrip("/")
+        if section not in SECTIONS and section not in ("calc", "trajectory", "report"):
+            raise RequestError(404, f"endpoint tidak ada: {path}")
+        if method == "GET":
+            payload = dict(query)
+        elif method == "POST":
+            try:
+                payload = json.loads(body or b"{}")
+            except ValueError:
+                raise RequestError(400, "body bukan JSON valid") from None
+        else:
+            raise RequestError(405, f"method {method} tidak didukung")
+
+        if section == "calc" and isinstance(payload, list):
+            designs = [parse_design(p, self.mat_db) for p in payload]
+            rows = evaluate(designs, self.mat_db, trajectory=False) if designs else []
+            for i, r in enumerate(rows):
+                if isinstance(r, RequestError):
+                    raise RequestError(r.status, f"desain #{i}: {r}")
+            return self._json(rows)
+        design = parse_design(payload, self.mat_db)
+        if section == "report":
+            data = await asyncio.get_running_loop().run_in_executor(self.pool, _render_pdf, design[:8])
+            return 200, "application/pdf", data
+        res = await self.batcher.submit((design, section == "trajectory"))
+        return self._json(res if section == "calc" else res[section])
+
+    @staticmethod
+    def _json(obj):
+        return 200, "application/json", json.dumps(obj, allow_nan=False).encode()
+
+    async def serve_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    method, target, version = line.decode("latin-1").split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    k, _, v = h.decode("latin-1").partition(":")
+                    headers[k.strip().lower()] = v.strip()
+                keep_alive = headers.get("connection", "").lower() != "close" if version == "HTTP/1.1" else headers.get("connection", "").lower() == "keep-alive"
+                url = urlsplit(target)
+                try:
+                    try:
+                        length = int(headers.get("content-length") or 0)
+                    except ValueError:
+                        length = -1
+                    if length < 0:
+                        keep_alive = False
+                        raise RequestError(400, "Content-Length tidak valid")
+                    if length > MAX_BODY:
+                        raise RequestError(413, "body terlalu besar")
+                    body = await reader.readexactly(length) if length else b""
+                    status, ctype, data = await self.handle(method, url.path, parse_qsl(url.query), body)
+                except RequestError as e:
+                    status, ctype, data = e.status, "application/json", json.dumps({"error": str(e)}).encode()
+                except Exception as e:
+                    status, ctype, data = 500, "application/json", json.dumps({"error": repr(e)}).encode()
+                writer.write(f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\nContent-Type: {ctype}\r\nContent-Length: {len(data)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data)
+                await writer.drain()
+                if not keep_alive or status == 413:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+
+async def serve(host, port, workers, max_batch, max_delay):
+    svc = CalcService(workers, max_batch, max_delay)
+    server = await asyncio.start_server(svc.serve_client, host, port, backlog=1024)
+    print(f"conveyor service di http://{host}:{port} (batch {max_batch} / {max_delay*1000:g} ms, {workers} PDF worker)", flush=True)
+    loop = asyncio.get_running_loop()
+    stop = loop.create_future()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, lambda: stop.done() or stop.set_result(None))
+        except NotImplementedError:   # Windows: Ctrl+C tetap lewat KeyboardInterrupt
+            pass
+    try:
+        async with server:
+            await stop
+    finally:
+        svc.close()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m conveyor.service", description="HTTP/JSON service perhitungan conveyor (lokal).")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("-j", "--workers", type=int, default=None, help="jumlah proses render PDF (default: jumlah CPU)")
+    ap.add_argument("--batch-size", type=int, default=MAX_BATCH, help=f"maks desain per micro-batch (default {MAX_BATCH})")
+    ap.add_argument("--batch-delay-ms", type=float, default=BATCH_DELAY * 1000, help=f"maks tunggu micro-batch (default {BATCH_DELAY*1000:g} ms)")
+    args = ap.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers or common.cpu_count(), args.batch_size, args.batch_delay_ms / 1000))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
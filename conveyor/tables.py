@@ -0,0 +1,232 @@
+"""Tabel kapasitas & koefisien daya untuk seluruh katalog material (disk-cached).
+
+    python -m conveyor.tables                              # build / cek tabel
+    python -m conveyor.tables --chart "Batu Bara" chart.png --trough 35
+    python -m conveyor.tables --csv capacity.csv
+
+Tabel dibangun sekali dengan BatchEngine untuk material x lebar x trough x speed,
+disimpan sebagai .npz, dan otomatis dibangun ulang bila database material, rumus
+(engine.py / batch.py / tables.py) atau grid berubah; bila folder cache tidak bisa ditulis, tabel
+tetap dipakai dari memori. Query balik ("TPH maks 1000 mm @ 2.5 m/s",
+"belt terkecil untuk 1200 TPH") cukup indexing + interpolasi pada tabel.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+
+import numpy as np
+
+from . import engine, batch, common
+from .common import KW_FACTOR
+from .engine import get_materials
+from .batch import BatchEngine
+from .optimizer import STD_WIDTHS, STD_TROUGHS, SPEED_GRID
+
+TABLE_DIR = os.environ.get("CONVEYOR_TABLE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "conveyor"))
+TABLE_FILE = "capacity_tables.npz"
+TABLE_VERSION = 1
+KY_VALUES = [0.035, 0.025]   # Ky engine: 0.035 bila L < 500 ft, selain itu 0.025
+
+
+def signature(mat_db=None, widths=STD_WIDTHS, troughs=STD_TROUGHS, speeds=SPEED_GRID):
+    """Hash isi database material, source rumus (engine, batch, common & koefisien daya di modul ini), dan grid."""
+    h = hashlib.sha256()
+    h.update(json.dumps(mat_db or get_materials(), sort_keys=True).encode())
+    for path in (engine.__file__, batch.__file__, common.__file__, __file__):
+        with open(path, "rb") as fh:
+            h.update(fh.read())
+    h.update(json.dumps([TABLE_VERSION, list(map(float, widths)), list(map(float, troughs)), list(map(float, speeds))]).encode())
+    return h.hexdigest()
+
+
+def build_tables(mat_db=None, widths=STD_WIDTHS, troughs=STD_TROUGHS, speeds=SPEED_GRID):
+    """Hitung semua tabel (dict array). cap_full: TPH (metrik) pada load 100%, shape (material, width, trough, speed)."""
+    mat_db = mat_db or get_materials()
+    materials = np.array(list(mat_db.keys()))
+    widths = np.asarray(widths, dtype=float); troughs = np.asarray(troughs, dtype=float); speeds = np.asarray(speeds, dtype=float)
+    m, w, t, v = np.meshgrid(materials, widths, troughs, speeds, indexing='ij')
+    geo = BatchEngine(m.ravel(), 1.0, w.ravel(), v.ravel(), 0, 0, t.ravel(), 0, mat_db=mat_db).calc_geometry()
+    cap_full = (geo['design_cap'] / 1.1023).reshape(m.shape)
+
+    # Koefisien daya per (width, speed): kW = idle[ky]*L + tac + (lift*H + fric[ky]*L) * TPH
+    # (Wm*V_fpm = 33.3 Q, jadi suku material tidak bergantung speed.)
+    W_in = widths[:, None] / 25.4
+    V_fpm = speeds[None, :] * 196.85
+    Wb = 3 + (W_in / 4)
+    ky = np.array(KY_VALUES)[:, None, None]
+    idle = KW_FACTOR * V_fpm * (0.2 + ky*Wb + 0.015*Wb) * 3.281        # kW per m panjang
+    tac = KW_FACTOR * V_fpm * (200 + (5 * W_in))                        # kW skirt/aksesori
+    lift = KW_FACTOR * 33.3 * 1.1023 * 3.281                             # kW per (TPH . m lift)
+    fric = lift * np.array(KY_VALUES)                                    # kW per (TPH . m panjang)
+    return {"materials": materials, "widths": widths, "troughs": troughs, "speeds": speeds, "cap_full": cap_full,
+            "kw_idle": idle, "kw_tac": np.broadcast_to(tac, idle.shape[1:]).copy(), "kw_lift": np.float64(lift), "kw_fric": fric,
+            "max_v": np.array([mat_db[n]['max_v'] / 196.85 for n in materials])}
+
+
+def save_tables(path, sig, data):
+    """Tulis tabel ke .npz secara atomik (file sementara unik di folder tujuan lalu rename)."""
+    folder = os.path.dirname(path) or "."
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=folder, prefix=".capacity-", suffix=".tmp.npz")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            np.savez(fh, signature=np.array(sig), **data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class CapacityTable:
+    """Lookup kapasitas & daya dari tabel precomputed."""
+
+    def __init__(self, data):
+        self.data = data
+        self.materials = list(data["materials"])
+        self.widths = data["widths"]; self.troughs = data["troughs"]; self.speeds = data["speeds"]
+        self.cap_full = data["cap_full"]
+
+    @classmethod
+    def load(cls, path=None, rebuild=False, mat_db=None):
+        """Baca tabel dari disk; bangun & simpan ulang bila belum ada atau signature berubah."""
+        path = path or os.path.join(TABLE_DIR, TABLE_FILE)
+        sig = signature(mat_db)
+        if not rebuild and os.path.exists(path):
+            try:
+                with np.load(path, allow_pickle=False) as f:
+                    if str(f["signature"]) == sig:
+                        return cls({k: f[k] for k in f.files})
+            except (OSError, ValueError, KeyError):
+                pass
+        data = build_tables(mat_db)
+        try:
+            save_tables(path, sig, data)
+        except OSError:
+            pass    # cache tidak bisa ditulis (mis. home read-only): pakai tabel di memori
+        return cls(data)
+
+    def _index(self, material, width=None, trough=None):
+        try:
+            mi = self.materials.index(material)
+        except ValueError:
+            raise KeyError(material) from None
+        idx = [mi]
+        for val, grid, name in ((width, self.widths, "width"), (trough, self.troughs, "trough")):
+            if val is None:
+                continue
+            j = np.flatnonzero(grid == float(val))
+            if not len(j):
+                raise ValueError(f"{name} {val} tidak ada di tabel ({list(grid)})")
+            idx.append(int(j[0]))
+        return tuple(idx)
+
+    def _check_speed(self, speed):
+        speed = np.asarray(speed, dtype=float)
+        if np.any((speed < self.speeds[0]) | (speed > self.speeds[-1])):
+            raise ValueError(f"speed di luar grid tabel ({self.speeds[0]}-{self.speeds[-1]} m/s)")
+        return speed
+
+    def capacity(self, material, width, speed, trough=35, fill=100):
+        """TPH pada load `fill` % (interpolasi linear di grid speed)."""
+        row = self.cap_full[self._index(material, width, trough)]
+        return np.interp(self._check_speed(speed), self.speeds, row) * fill / 100
+
+    def load_pct(self, material, width, speed, tph, trough=35):
+        return tph / self.capacity(material, width, speed, trough) * 100
+
+    def smallest_width(self, material, tph, speed=None, trough=35, fill=85, lump=0, widths=None):
+        """Lebar standar terkecil yang memuat tph pada load <= fill dan lolos cek lump.
+
+        speed=None memakai kecepatan maksimum rekomendasi material. Return None bila
+        tidak ada lebar yang cukup.
+        """
+        m, t = self._index(material, trough=trough)
+        if speed is None:
+            speed = min(float(self.data["max_v"][m]), self.speeds[-1])
+        speed = self._check_speed(speed)
+        caps = np.array([np.interp(speed, self.speeds, self.cap_full[m, i, t]) for i in range(len(self.widths))]) * fill / 100
+        ok = (caps >= tph) & (lump <= self.widths / 3)
+        if widths is not None:
+            ok &= np.isin(self.widths, np.asarray(widths, dtype=float))
+        hit = np.flatnonzero(ok)
+        return int(self.widths[hit[0]]) if len(hit) else None
+
+    def min_speed(self, material, tph, width, trough=35, fill=85):
+        """Speed terkecil di grid yang memuat tph pada load <= fill (None bila tidak ada)."""
+        caps = self.cap_full[self._index(material, width, trough)] * fill / 100
+        hit = np.flatnonzero(caps >= tph)
+        return float(self.speeds[hit[0]]) if len(hit) else None
+
+    def power(self, width, speed, tph, length, lift):
+        """Daya motor (kW) dari koefisien tabel, identik dengan calc_power_tension."""
+        wi = self._index(self.materials[0], width)[1]
+        k = 0 if length * 3.281 < 500 else 1
+        speed = self._check_speed(speed)
+        idle = np.interp(speed, self.speeds, self.data["kw_idle"][k, wi])
+        tac = np.interp(speed, self.speeds, self.data["kw_tac"][wi])
+        return idle * length + tac + (self.data["kw_lift"] * lift + self.data["kw_fric"][k] * length) * tph
+
+    def chart(self, material, trough=35, fill=100, fmt="png"):
+        """Capacity chart gaya CEMA (TPH vs speed per lebar belt)."""
+        from . import plots
+        m, t = self._index(material, trough=trough)
+        return plots.capacity_chart(self.speeds, self.widths, self.cap_full[m, :, t, :] * fill / 100, material, trough, fill,
+                                    float(self.data["max_v"][m]), fmt)
+
+    def to_frame(self, fill=100):
+        """Tabel long-format: material, width, trough, speed, tph."""
+        import pandas as pd
+        m, w, t, v = np.meshgrid(np.arange(len(self.materials)), self.widths, self.troughs, self.speeds, indexing='ij')
+        return pd.DataFrame({"material": np.array(self.materials)[m.ravel()], "width": w.ravel().astype(int), "trough": t.ravel().astype(int),
+                             "speed": v.ravel(), "tph": (self.cap_full * fill / 100).ravel()})
+
+
+_table = None
+_table_lock = threading.Lock()
+
+
+def get_table():
+    """Tabel default (dibaca dari disk sekali per proses, aman dipanggil dari banyak sesi)."""
+    global _table
+    if _table is None:
+        with _table_lock:
+            if _table is None:
+                _table = CapacityTable.load()
+    return _table
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m conveyor.tables", description="Build / export tabel kapasitas conveyor.")
+    ap.add_argument("--rebuild", action="store_true", help="paksa bangun ulang tabel")
+    ap.add_argument("--path", default=None, help=f"lokasi file tabel (default {os.path.join(TABLE_DIR, TABLE_FILE)})")
+    ap.add_argument("--chart", nargs=2, metavar=("MATERIAL", "OUT"), help="export capacity chart (.png/.svg/.pdf)")
+    ap.add_argument("--trough", type=int, default=35)
+    ap.add_argument("--fill", type=float, default=100, help="load %% untuk chart/CSV (default 100)")
+    ap.add_argument("--csv", metavar="OUT", help="export tabel kapasitas ke CSV")
+    args = ap.parse_args(argv)
+    try:
+        tbl = CapacityTable.load(args.path, rebuild=args.rebuild)
+        if args.chart:
+            material, out = args.chart
+            with open(out, "wb") as fh:
+                fh.write(tbl.chart(material, args.trough, args.fill, fmt=os.path.splitext(out)[1].lstrip(".").lower() or "png"))
+            print(f"chart {material} ({args.trough} deg) ditulis ke {out}")
+        if args.csv:
+            tbl.to_frame(args.fill).to_csv(args.csv, index=False)
+            print(f"tabel ditulis ke {args.csv}")
+    except (KeyError, ValueError, OSError) as e:
+        print(f"error: {e!r}", file=sys.stderr)
+        return 2
+    print(f"{tbl.cap_full.size:,} entri kapasitas ({len(tbl.materials)} material x {len(tbl.widths)} lebar x {len(tbl.troughs)} trough x {len(tbl.speeds)} speed)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
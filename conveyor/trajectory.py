@@ -0,0 +1,123 @@
+import numpy as np
+
+# --- TRAJECTORY & CHUTE IMPACT SOLVER ---
+# Versi batch dari TitanEngine.calc_trajectory: semua kombinasi stream x pulley x speed
+# dihitung sekaligus dalam satu pass NumPy. Titik impact dicari secara analitik
+# (perpotongan parabola lintasan dengan tiap sisi chute = persamaan kuadrat di t).
+# Koordinat sama dengan calc_trajectory: origin di pusat head pulley, satuan meter.
+
+SPEED_RANGE = np.round(np.arange(0.5, 6.0 + 1e-9, 0.1), 2)
+PULLEY_SIZES = [315, 400, 500, 630, 800, 1000, 1250]
+# Tebal stream di atas belt sebagai fraksi lebar belt: "center" = stream calc_trajectory.
+STREAMS = {"lower": 0.0, "center": 0.1, "upper": 0.2}
+# Nama sisi polyline chute_outline. Outlet adalah bukaan bawah, bukan permukaan impact.
+CHUTE_EDGES = ["Hood", "Impact Wall", "Outlet", "Back Wall"]
+OUTLET_EDGE = CHUTE_EDGES.index("Outlet")
+PASSES_OUTLET = -2          # kode surface: lintasan keluar lewat outlet tanpa menyentuh dinding
+G_FT = 32.17
+
+
+def chute_outline(rp, max_x, chute_w, chute_h, hood_h):
+    """Titik polyline chute box (hood -> impact wall -> outlet -> back wall) + posisi impact wall."""
+    hood_x_start = -rp - 0.2; impact_wall_x = max_x + 0.5
+    if impact_wall_x < chute_w: impact_wall_x = chute_w
+    pts = np.array([(hood_x_start, rp + hood_h), (impact_wall_x, rp + hood_h), (impact_wall_x, -chute_h), (impact_wall_x - chute_w, -chute_h), (hood_x_start, -rp)])
+    return pts, impact_wall_x
+
+
+class TrajectorySolver:
+    def __init__(self, w_mm, speeds, pulleys, streams=("lower", "upper")):
+        W_in = w_mm / 25.4
+        self.streams = list(streams)
+        self.speeds = np.atleast_1d(np.asarray(speeds, dtype=float))
+        self.pulleys = np.atleast_1d(np.asarray(pulleys, dtype=float))
+        # Bentuk array: (stream, pulley, speed)
+        frac = np.array([STREAMS[s] for s in self.streams])[:, None, None]
+        rp = (self.pulleys[None, :, None]/25.4)/12/2
+        r = rp + ((W_in*frac)/12)
+        v_fps = (self.speeds * 196.85 / 60)[None, None, :]
+        idx = v_fps**2 / (G_FT*r)
+        gamma = np.where(idx >= 1, 0.0, np.arccos(np.minimum(idx, 1.0)))
+        self.idx = np.broadcast_to(idx, r.shape[:2] + v_fps.shape[2:])
+        self.rp = rp * 0.3048
+        self.x0 = r * np.sin(gamma) * 0.3048
+        self.y0 = r * np.cos(gamma) * 0.3048
+        self.vx = v_fps * np.cos(gamma) * 0.3048
+        self.vy = -v_fps * np.sin(gamma) * 0.3048
+        self.g = G_FT * 0.3048
+
+    def paths(self, t=np.linspace(0, 1.5, 80)):
+        """Lintasan (x, y) semua kasus, shape (stream, pulley, speed, len(t))."""
+        t = np.asarray(t)
+        x = self.x0[..., None] + self.vx[..., None]*t
+        y = self.y0[..., None] + self.vy[..., None]*t - 0.5*self.g*t**2
+        return x, y
+
+    def envelope(self, xg):
+        """Batas bawah/atas semua lintasan pada grid x (NaN sebelum titik lepas)."""
+        xg = np.asarray(xg, dtype=float)
+        tt = (xg - self.x0[..., None]) / self.vx[..., None]
+        y = self.y0[..., None] + self.vy[..., None]*tt - 0.5*self.g*tt**2
+        y = np.where(tt >= 0, y, np.nan).reshape(-1, len(xg))
+        valid = ~np.all(np.isnan(y), axis=0)
+        lo = np.full(len(xg), np.nan); hi = np.full(len(xg), np.nan)
+        lo[valid] = np.nanmin(y[:, valid], axis=0); hi[valid] = np.nanmax(y[:, valid], axis=0)
+        return lo, hi
+
+    def impacts(self, chute_pts):
+        """Titik impact pertama tiap lintasan pada sisi-sisi chute (analitik, tanpa sampling).
+
+        Return dict array shape (stream, pulley, speed): x, y, t, surface (index CHUTE_EDGES,
+        -1 = tidak kena, PASSES_OUTLET = lewat bukaan outlet), v (kecepatan impact m/s),
+        angle (sudut terhadap permukaan, derajat). Untuk PASSES_OUTLET, x/y/t adalah titik
+        lintasan melewati outlet; v dan angle NaN karena tidak ada impact.
+        """
+        P1 = np.asarray(chute_pts[:-1], dtype=float); P2 = np.asarray(chute_pts[1:], dtype=float)
+        d = P2 - P1
+        nx, ny = -d[:, 1], d[:, 0]
+        E = (slice(None),) + (None,) * self.x0.ndim
+        nx, ny, p1x, p1y, dx, dy = nx[E], ny[E], P1[:, 0][E], P1[:, 1][E], d[:, 0][E], d[:, 1][E]
+        # n . (p(t) - P1) = 0  ->  a t^2 + b t + c = 0
+        a = -0.5*self.g*ny * np.ones_like(self.x0)
+        b = nx*self.vx + ny*self.vy
+        c = nx*(self.x0 - p1x) + ny*(self.y0 - p1y)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            disc = np.sqrt(np.where(b*b - 4*a*c >= 0, b*b - 4*a*c, np.nan))
+            lin = np.abs(a) < 1e-12
+            r1 = np.where(lin, -c/b, (-b - disc)/(2*a))
+            r2 = np.where(lin, np.nan, (-b + disc)/(2*a))
+            roots = np.stack([r1, r2])                              # (2, edge, ...)
+            px = self.x0 + self.vx*roots
+            py = self.y0 + self.vy*roots - 0.5*self.g*roots**2
+            s = ((px - p1x)*dx + (py - p1y)*dy) / (dx*dx + dy*dy)
+        ok = (roots > 1e-9) & (s >= -1e-9) & (s <= 1 + 1e-9)
+        roots = np.where(ok, roots, np.inf).min(axis=0)              # (edge, ...)
+        surface = np.argmin(roots, axis=0)
+        t = np.take_along_axis(roots, surface[None], axis=0)[0]
+        cross = np.isfinite(t)
+        hit = cross & (surface != OUTLET_EDGE)
+        t = np.where(cross, t, np.nan)
+        surface = np.where(hit, surface, np.where(cross, PASSES_OUTLET, -1))
+        x = self.x0 + self.vx*t
+        y = self.y0 + self.vy*t - 0.5*self.g*t**2
+        vxi, vyi = self.vx * np.ones_like(t), self.vy - self.g*t
+        v = np.hypot(vxi, vyi)
+        ln = np.hypot(nx, ny)
+        vn = np.abs(vxi*nx + vyi*ny) / ln                            # komponen normal per edge
+        vn = np.take_along_axis(vn, np.maximum(surface, 0)[None], axis=0)[0]
+        angle = np.degrees(np.arcsin(np.clip(vn / v, 0, 1)))
+        return {"x": x, "y": y, "t": t, "surface": surface, "v": np.where(hit, v, np.nan), "angle": np.where(hit, angle, np.nan)}
+
+
+def batch_trajectory(w_mm, v_mps, p_dia_mm, t=np.linspace(0, 1.5, 80)):
+    """calc_trajectory per baris untuk banyak desain sekaligus: (x, y) shape (N, len(t)), rp, idx."""
+    W_in = np.atleast_1d(np.asarray(w_mm, dtype=float)) / 25.4
+    v_fps = np.atleast_1d(np.asarray(v_mps, dtype=float)) * 196.85 / 60
+    rp = (np.atleast_1d(np.asarray(p_dia_mm, dtype=float))/25.4)/12/2
+    W_in, v_fps, rp = np.broadcast_arrays(W_in, v_fps, rp)
+    r = rp + ((W_in*STREAMS["center"])/12)
+    idx = v_fps**2 / (G_FT*r)
+    gamma = np.where(idx >= 1, 0.0, np.arccos(np.minimum(idx, 1.0)))[:, None]
+    x = r[:, None] * np.sin(gamma) + (v_fps[:, None]*np.cos(gamma)*t)
+    y = r[:, None] * np.cos(gamma) + (-v_fps[:, None]*np.sin(gamma)*t) - (0.5*G_FT*t**2)
+    return x*0.3048, y*0.3048, rp*0.3048, idx
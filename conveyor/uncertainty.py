@@ -0,0 +1,64 @@
+import numpy as np
+
+from .engine import get_materials
+from .batch import BatchEngine
+
+# --- MONTE CARLO UNCERTAINTY ---
+# Density & surcharge material berubah dengan kadar air, dan feed rate sesekali
+# surge di atas TPH nominal. Sampel didorong lewat rumus geometry & power/tension
+# BatchEngine (vectorized), diproses per chunk agar memori tetap kecil di 1e6 sampel.
+#
+# Model sebaran (semua relatif terhadap nilai database / input desain):
+#   den  ~ Normal(den, den_cv*den), dipotong minimal 50% nominal
+#   sur  ~ Normal(sur, sur_sd) derajat, dipotong 0..45
+#   cap  ~ Normal(cap, cap_cv*cap) x (1 + surge), surge ~ Uniform(0, surge_max) dengan
+#          peluang surge_prob (selain itu 0)
+
+SPREAD = {"den_cv": 0.08, "sur_sd": 3.0, "cap_cv": 0.05, "surge_prob": 0.10, "surge_max": 0.30}
+N_SAMPLES = 200_000
+MAX_SAMPLES = 1_000_000
+CHUNK_SIZE = 1 << 17
+OVERLOAD_PCT = 100
+SPILL_PCT = 85
+SLIP_RATIO = 3.0
+HIST_BINS = 60
+
+
+def sample_inputs(rng, n, den, sur, cap, spread=None):
+    """Sampel (den, sur, cap) sebanyak n dari generator rng."""
+    sp = {**SPREAD, **(spread or {})}
+    d = np.maximum(rng.normal(den, sp["den_cv"] * den, n), 0.5 * den)
+    s = np.clip(rng.normal(sur, sp["sur_sd"], n), 0.0, 45.0)
+    surge = np.where(rng.random(n) < sp["surge_prob"], rng.uniform(0.0, sp["surge_max"], n), 0.0)
+    c = np.maximum(rng.normal(cap, sp["cap_cv"] * cap, n), 0.0) * (1 + surge)
+    return d, s, c
+
+
+def run_monte_carlo(design, n=N_SAMPLES, seed=None, spread=None, mat_db=None):
+    """Analisis ketidakpastian untuk design = (material, cap, w, v, L, H, trough, lump).
+
+    Return dict: jumlah sampel, peluang overload/spill/slip, persentil load & kW, dan
+    histogram (counts, edges) load_pct & kW untuk plotting (sampel mentah tidak disimpan).
+    """
+    sel_mat, cap, sel_w, sel_v, length, lift, trough, lump = design
+    mat = (mat_db or get_materials())[sel_mat]
+    n = int(min(max(n, 1), MAX_SAMPLES))
+    rng = np.random.default_rng(seed)
+    load = np.empty(n); kW = np.empty(n); PIW = np.empty(n)
+    slip = 0
+    for i in range(0, n, CHUNK_SIZE):
+        k = min(CHUNK_SIZE, n - i)
+        den, sur, cap_s = sample_inputs(rng, k, mat['den'], mat['sur'], cap, spread)
+        eng = BatchEngine(sel_mat, cap_s, sel_w, sel_v, length, lift, trough, lump, den=den, sur=sur, exact=False)
+        pwr = eng.calc_power_tension()
+        load[i:i + k] = eng.calc_geometry()['load_pct']
+        kW[i:i + k] = pwr['kW']
+        PIW[i:i + k] = pwr['PIW']
+        slip += int(np.count_nonzero(pwr['Ratio'] > SLIP_RATIO))
+    load_q = np.percentile(load, [50, 95])
+    kW_q = np.percentile(kW, [50, 95])
+    return {"n": n, "seed": seed,
+            "p_overload": float(np.mean(load > OVERLOAD_PCT)), "p_spill": float(np.mean(load > SPILL_PCT)), "p_slip": slip / n,
+            "load_p50": float(load_q[0]), "load_p95": float(load_q[1]), "kW_p50": float(kW_q[0]), "kW_p95": float(kW_q[1]),
+            "PIW_p95": float(np.percentile(PIW, 95)),
+            "load_hist": np.histogram(load, bins=HIST_BINS), "kW_hist": np.histogram(kW, bins=HIST_BINS)}
@@ -1,12 +1,18 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import math
-import matplotlib.pyplot as plt
-from matplotlib.patches import Polygon, Circle, Rectangle
-from fpdf import FPDF
-import base64
-from datetime import datetime
+import io
+import os
+import uuid
+from functools import partial
+from conveyor import get_materials, TitanEngine
+from conveyor.optimizer import sweep, merge, rank, pareto_mask, STD_WIDTHS, STD_TROUGHS
+from conveyor.cache import engine_cache, figure_cache, pdf_cache, cache_stats
+from conveyor import plots, perf
+from conveyor.profile import ProfileEngine
+from conveyor.uncertainty import run_monte_carlo, SPREAD, N_SAMPLES, MAX_SAMPLES, SPILL_PCT, OVERLOAD_PCT
+from conveyor.tables import get_table
+from conveyor.trajectory import TrajectorySolver, batch_trajectory, chute_outline, CHUTE_EDGES, PASSES_OUTLET, PULLEY_SIZES, SPEED_RANGE
 
 # --- 1. KONFIGURASI SYSTEM & STYLE ---
 st.set_page_config(
@@ -33,136 +39,36 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# --- 2. DATABASE MATERIAL ---
-def get_materials():
-    return {
-        "Urea (Prills)": {"den": 45, "rep": 30, "sur": 20, "max_v": 600, "desc": "Produk Urea butiran kecil. Berdebu & Higroskopis.", "liner": "SS304 / UHMWPE"}, 
-        "Urea (Granul)": {"den": 48, "rep": 32, "sur": 25, "max_v": 650, "desc": "Produk Urea butiran besar. Flowability baik.", "liner": "SS304"},
-        "ZA (Ammonium Sulfate)": {"den": 60, "rep": 32, "sur": 25, "max_v": 550, "desc": "Kristal/Granul. Sifat Korosif Tinggi (Asam).", "liner": "SS316L"},
-        "NPK (Phonska)": {"den": 62, "rep": 34, "sur": 25, "max_v": 600, "desc": "Butiran Majemuk. Korosif & Abrasif sedang.", "liner": "SS304 / AR Steel"},
-        "SP-36": {"den": 70, "rep": 35, "sur": 25, "max_v": 600, "desc": "Butiran abu-abu. Debu fosfat.", "liner": "AR400 / SS304"},
-        "Petroganik": {"den": 40, "rep": 35, "sur": 25, "max_v": 500, "desc": "Pupuk Organik. Ringan, berserat, bridging.", "liner": "UHMWPE"},
-        "Batuan Fosfat": {"den": 85, "rep": 40, "sur": 30, "max_v": 800, "desc": "Bahan baku. Sangat Abrasif & Berat.", "liner": "Ceramic Tile"},
-        "Sulfur": {"den": 65, "rep": 35, "sur": 25, "max_v": 500, "desc": "Bahaya ledakan debu & statis.", "liner": "SS304 (Spark Free)"},
-        "Kapur (Limestone)": {"den": 90, "rep": 38, "sur": 30, "max_v": 800, "desc": "Penetral pH. Berat & Berdebu.", "liner": "AR400 Steel"},
-        "Batu Bara": {"den": 50, "rep": 35, "sur": 25, "max_v": 900, "desc": "Fuel Boiler.", "liner": "AR400 Steel"},
-    }
-
-def get_idler_limits(width_in):
-    if width_in <= 36: return {"B": 410, "C": 900, "D": 1200}
-    elif width_in <= 48: return {"B": 410, "C": 900, "D": 1200}
-    else: return {"C": 850, "D": 1200, "E": 1800}
-
-def get_min_pulley(piw):
-    if piw <= 150: return 315
-    elif piw <= 250: return 400
-    elif piw <= 400: return 500
-    elif piw <= 600: return 630
-    elif piw <= 800: return 800
-    else: return 1000
-
-# --- 3. CALCULATION ENGINE ---
-class TitanEngine:
-    def __init__(self, mat_props, cap, w_mm, v_mps, l_m, h_m, trough_deg, lump_mm):
-        self.mat = mat_props
-        self.Q = cap * 1.1023 
-        self.W_in = w_mm / 25.4
-        self.V_fpm = v_mps * 196.85
-        self.L = l_m * 3.281
-        self.H = h_m * 3.281
-        self.trough = math.radians(trough_deg)
-        self.trough_deg = trough_deg
-        self.lump_mm = lump_mm
-        
-    def calc_geometry(self):
-        edge_std = 0.055 * self.W_in + 0.9
-        bw_max = self.W_in - (2 * edge_std)
-        c_roll = 0.371 * self.W_in
-        h_wing = ((bw_max - c_roll)/2) * math.sin(self.trough)
-        area_trap = (c_roll * h_wing) + (((bw_max - c_roll)/2) * h_wing)
-        area_sur = (bw_max**2 * math.tan(math.radians(self.mat['sur']))) / 6
-        design_cap = ((area_trap + area_sur)/144 * self.V_fpm * 60 * self.mat['den']) / 2000
-        load_pct = (self.Q / design_cap * 100) if design_cap > 0 else 0
-        bw_act = bw_max * math.sqrt(load_pct/100) if load_pct > 0 else 0
-        edge_act = (self.W_in - bw_act)/2
-        
-        # Lump Check
-        max_allowed_lump = self.W_in / 3 * 25.4
-        is_lump_ok = self.lump_mm <= max_allowed_lump
-        
-        return {"load_pct": load_pct, "edge_act": edge_act, "bw_act": bw_act, "c_roll": c_roll, "bw_max": bw_max, "lump_ok": is_lump_ok, "max_lump": max_allowed_lump}
-
-    def calc_power_tension(self):
-        Wb = 3 + (self.W_in / 4)
-        Wm = (33.3 * self.Q) / self.V_fpm
-        Tac = 200 + (5 * self.W_in) 
-        Ky = 0.035 if self.L < 500 else 0.025
-        Te = self.L * (0.2 + Ky*Wb + 0.015*Wb) + Wm*(self.L*Ky + self.H) + Tac
-        T2 = max(Te * 0.35, 12.5*(Wb+Wm))
-        T1 = Te + T2
-        PIW = T1 / self.W_in
-        HP = (Te * self.V_fpm) / 33000
-        kW = HP * 0.746 / 0.90
-        trac_ratio = T1/T2
-        is_slip = trac_ratio > 3.0 
-        return {"kW": kW, "T1": T1, "T2": T2, "Te": Te, "PIW": PIW, "Wb": Wb, "Wm": Wm, "Slip": is_slip, "Ratio": trac_ratio}
-
-    def calc_components(self, T1, Wm, Wb):
-        spacing = 4.0 if Wm < 100 else 3.0
-        load = (Wb + Wm) * spacing
-        limits = get_idler_limits(self.W_in)
-        series = "E"
-        for s, lim in limits.items():
-            if load < lim:
-                series = s
-                break
-        rec_p = get_min_pulley(T1/self.W_in)
-        r_min = (1.6 * T1) / Wb * 0.3048 
-        return {"Series": series, "Load": load, "RecPulley": rec_p, "Curve": r_min}
-
-    def calc_construction_data(self, T1, PIW):
-        trough_factor = 3.2 if self.trough_deg == 35 else (4.0 if self.trough_deg == 45 else 2.0)
-        trans_dist_m = (trough_factor * self.W_in) * 0.0254
-        takeup_len_m = self.L * 0.3048 * 0.015 
-        return {"TransDist": trans_dist_m, "TakeupTravel": takeup_len_m}
-
-    def calc_trajectory(self, p_dia_mm):
-        rp = (p_dia_mm/25.4)/12/2
-        r = rp + ((self.W_in*0.1)/12)
-        v_fps = self.V_fpm/60
-        g = 32.17
-        idx = v_fps**2 / (g*r)
-        gamma = 0 if idx>=1 else math.acos(idx)
-        t = np.linspace(0, 1.5, 80)
-        x = r * math.sin(gamma) + (v_fps*math.cos(gamma)*t)
-        y = r * math.cos(gamma) + (-v_fps*math.sin(gamma)*t) - (0.5*g*t**2)
-        return x*0.3048, y*0.3048, rp*0.3048, idx
-
-# --- 4. PDF REPORT GENERATOR CLASS ---
-class EngineeringReport(FPDF):
-    def header(self):
-        self.set_font('Arial', 'B', 14)
-        self.cell(0, 10, 'BELT CONVEYOR CALCULATION REPORT', 0, 1, 'C')
-        self.set_font('Arial', 'I', 10)
-        self.cell(0, 10, f'Generated on: {datetime.now().strftime("%Y-%m-%d %H:%M")}', 0, 1, 'C')
-        self.line(10, 30, 200, 30)
-        self.ln(10)
-
-    def footer(self):
-        self.set_y(-15)
-        self.set_font('Arial', 'I', 8)
-        self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'C')
-
-    def section_title(self, title):
-        self.set_font('Arial', 'B', 12)
-        self.set_fill_color(230, 230, 230)
-        self.cell(0, 10, title, 0, 1, 'L', True)
-        self.ln(2)
-
-    def data_row(self, label, value):
-        self.set_font('Arial', '', 10)
-        self.cell(90, 8, label, 1)
-        self.cell(0, 8, str(value), 1, 1)
+# --- 1b. PROFILING (lihat conveyor/perf.py) ---
+# Span selalu diukur (murah); panel "Performance" hanya tampil dengan URL ?perf=1
+# atau env CONVEYOR_PERF=1. Log JSON per span aktif bila CONVEYOR_PERF_LOG di-set.
+PERF_PANEL = st.query_params.get("perf") == "1" or os.environ.get("CONVEYOR_PERF") == "1"
+perf_trace = perf.start_trace(st.session_state.setdefault("perf_session", uuid.uuid4().hex[:8]))
+
+# --- 2-3. DATABASE MATERIAL & CALCULATION ENGINE: lihat conveyor/engine.py ---
+
+# --- 4. PDF REPORT GENERATOR CLASS: lihat conveyor/report.py ---
+
+# --- 4b. CACHED ENGINE ---
+# Semua hasil dikunci dengan input desain, jadi rerun yang tidak mengubah input
+# (mis. geser slider chute) tidak menghitung ulang engine/figure/PDF.
+@engine_cache
+def run_engine(mat_name, cap, w_mm, v_mps, l_m, h_m, trough_deg, lump_mm):
+    eng = TitanEngine(get_materials()[mat_name], cap, w_mm, v_mps, l_m, h_m, trough_deg, lump_mm)
+    with perf.span("engine.calc_geometry"):
+        geo = eng.calc_geometry()
+    with perf.span("engine.calc_power_tension"):
+        pwr = eng.calc_power_tension()
+    with perf.span("engine.calc_components"):
+        comp = eng.calc_components(pwr['T1'], pwr['Wm'], pwr['Wb'])
+    with perf.span("engine.calc_construction_data"):
+        cons = eng.calc_construction_data(pwr['T1'], pwr['PIW'])
+    return eng, geo, pwr, comp, cons
+
+@engine_cache
+def run_profile(design, segments):
+    sel_mat, cap, sel_w, sel_v, length, lift, trough, lump = design
+    return ProfileEngine(get_materials()[sel_mat], cap, sel_w, sel_v, segments, trough, lump).calc_tension_profile()
 
 # --- 5. SIDEBAR & INPUT ---
 st.sidebar.image("https://upload.wikimedia.org/wikipedia/commons/thumb/2/2f/Petrokimia_Gresik_logo.svg/1200px-Petrokimia_Gresik_logo.svg.png", width=80)
@@ -189,12 +95,9 @@ if mode == "👤 Operasional (Auto)":
     sel_v = 1.5 if spd_opt=="Slow (Awet)" else (2.2 if spd_opt=="Normal" else 3.0)
     
     if st.sidebar.button("✨ Cari Ukuran Ideal"):
-        for w in [500,650,800,1000,1200,1400,1600,2000]:
-            e = TitanEngine(mat_data, cap, w, sel_v, length, lift, 35, lump)
-            g = e.calc_geometry()
-            if g['load_pct'] <= 85 and g['lump_ok']:
-                st.session_state['rec_w'] = w
-                break
+        ops_w = [500,650,800,1000,1200,1400,1600,2000]
+        rec_w = get_table().smallest_width(sel_mat, cap, sel_v, 35, 85, lump, ops_w)
+        if rec_w: st.session_state['rec_w'] = rec_w
     sel_w = st.sidebar.selectbox("Lebar Belt (mm)", [500,650,800,1000,1200,1400,1600,2000], index=[500,650,800,1000,1200,1400,1600,2000].index(st.session_state.get('rec_w', 800)))
 else:
     st.sidebar.markdown("### 🔧 Fine Tuning")
@@ -203,11 +106,9 @@ else:
     sel_v = st.sidebar.slider("Belt Speed (m/s)", 0.5, 6.0, 2.0, 0.1)
 
 # --- EXECUTION ---
-eng = TitanEngine(mat_data, cap, sel_w, sel_v, length, lift, trough, lump)
-geo = eng.calc_geometry()
-pwr = eng.calc_power_tension()
-comp = eng.calc_components(pwr['T1'], pwr['Wm'], pwr['Wb'])
-cons = eng.calc_construction_data(pwr['T1'], pwr['PIW'])
+design = (sel_mat, cap, sel_w, sel_v, length, lift, trough, lump)
+with perf.span("execution.run_engine"):
+    eng, geo, pwr, comp, cons = run_engine(*design)
 
 # --- DASHBOARD ---
 st.markdown("<div class='main-header'>Belt Conveyor Calculation</div>", unsafe_allow_html=True)
@@ -236,72 +137,96 @@ k5.markdown(f"<div class='kpi-card'><div class='kpi-val'>{comp['RecPulley']} mm<
 st.write("")
 
 # --- PDF GENERATOR LOGIC ---
-def create_pdf():
-    pdf = EngineeringReport()
-    pdf.add_page()
-    
-    # 1. Design Parameter
-    pdf.section_title("1. DESIGN PARAMETERS")
-    pdf.data_row("Material Name", sel_mat)
-    pdf.data_row("Material Density", f"{mat_data['den']} lbs/ft3")
-    pdf.data_row("Design Capacity", f"{cap} TPH")
-    pdf.data_row("Belt Width", f"{sel_w} mm")
-    pdf.data_row("Belt Speed", f"{sel_v} m/s")
-    pdf.data_row("Conveyor Length", f"{length} m")
-    pdf.data_row("Lift Height", f"{lift} m")
-    
-    # 2. Calculated Results
-    pdf.ln(5)
-    pdf.section_title("2. ENGINEERING RESULTS (CEMA)")
-    pdf.data_row("Volumetric Loading", f"{int(geo['load_pct'])} %")
-    pdf.data_row("Motor Power (Shaft)", f"{pwr['kW']:.2f} kW")
-    pdf.data_row("Max Belt Tension (T1)", f"{int(pwr['T1'])} lbs")
-    pdf.data_row("Belt PIW Rating", f"{int(pwr['PIW'])} PIW")
-    pdf.data_row("Idler Load", f"{int(comp['Load'])} lbs")
-    pdf.data_row("Drive Traction Ratio", f"{pwr['Ratio']:.2f}")
-    
-    # 3. BOM
-    pdf.ln(5)
-    pdf.section_title("3. BILL OF MATERIALS")
-    pdf.data_row("Recommended Belt", f"EP-{int(pwr['PIW']*1.5)} / Grade {mat_data.get('desc','Gen')}")
-    pdf.data_row("Idler Series", f"CEMA {comp['Series']} / {trough} deg")
-    pdf.data_row("Head Pulley", f"Dia {comp['RecPulley']} mm / Rubber Lagged")
-    pdf.data_row("Motor Spec", f"Cage Motor 4P / {pwr['kW']:.2f} kW")
-    pdf.data_row("Chute Liner", mat_data['liner'])
-    
-    return pdf.output(dest='S').encode('latin-1', 'ignore')
+# Dibangun hanya saat tombol download diklik (deferred), hasilnya di-cache per desain.
+# conveyor.report (fpdf) juga baru di-import di sini, bukan saat startup aplikasi.
+@pdf_cache
+def create_pdf(design):
+    from conveyor import report
+    with perf.span("pdf.create_pdf"):
+        return report.create_pdf(design)
+
+def create_project_zip(csv_bytes):
+    from conveyor import report
+    buf = io.BytesIO()
+    with perf.span("pdf.project_zip"):
+        report.write_zip(report.read_designs(io.StringIO(csv_bytes.decode("utf-8-sig"))), buf)
+    return buf.getvalue()
+
+# --- FIGURE RENDERING (cached PNG, lihat conveyor/plots.py) ---
+# Key tiap figure hanya input yang benar-benar dipakai: ganti panjang/lift/kapasitas
+# tidak me-render ulang lintasan, dan penampang hanya ikut load % (bukan panjang/lift).
+@figure_cache
+def render_cross_section(w_mm, c_roll, bw_max, trough, sur, load_pct, lump):
+    return plots.cross_section(w_mm/25.4, c_roll, bw_max, trough, sur, load_pct, lump)
+
+@engine_cache
+def run_trajectory(w_mm, v_mps, p_dia):
+    """calc_trajectory (stream tengah) hanya dari lebar, speed & pulley."""
+    x, y, rp, idx = batch_trajectory(w_mm, v_mps, p_dia)
+    return x[0], y[0], float(rp[0]), float(idx[0])
+
+@engine_cache
+def run_impacts(w_mm, v_mps, p_dia, chute, speeds=None, pulleys=None):
+    """Impact upper/lower stream pada chute desain aktif; default hanya speed & pulley terpilih."""
+    xt, yt, rp, idx = run_trajectory(w_mm, v_mps, p_dia)
+    pts, _ = chute_outline(rp, float(np.max(xt)), *chute)
+    solver = TrajectorySolver(w_mm, speeds or [v_mps], pulleys or [p_dia])
+    return solver, pts, solver.impacts(pts)
+
+@figure_cache
+def render_trajectory(w_mm, v_mps, p_dia, chute_w, chute_h, hood_h):
+    xt, yt, rp, idx = run_trajectory(w_mm, v_mps, p_dia)
+    solver, pts, imp = run_impacts(w_mm, v_mps, p_dia, (chute_w, chute_h, hood_h))
+    x, y = solver.paths(np.linspace(0, 1.5, 80))
+    streams = [(x[i, 0, 0], y[i, 0, 0], f"{s.title()} Stream") for i, s in enumerate(solver.streams)]
+    hits = [(imp['x'][i, 0, 0], imp['y'][i, 0, 0]) for i in range(len(solver.streams)) if imp['surface'][i, 0, 0] >= 0]
+    return plots.trajectory(xt, yt, rp, idx, chute_w, chute_h, hood_h, streams=streams, impacts=hits)
+
+@figure_cache
+def render_trajectory_envelope(w_mm, v_mps, p_dia, chute, speeds, pulleys):
+    solver, pts, imp = run_impacts(w_mm, v_mps, p_dia, chute, speeds, pulleys)
+    xg = np.linspace(pts[:, 0].min(), pts[:, 0].max(), 400)
+    lo, hi = solver.envelope(xg)
+    hit = imp['surface'] >= 0
+    spd = np.broadcast_to(solver.speeds, hit.shape)
+    return plots.trajectory_envelope(xg, lo, hi, pts, imp['x'][hit], imp['y'][hit], spd[hit])
+
+def impact_rows(solver, imp, j, k):
+    """Baris tabel impact (per stream) untuk pulley index j & speed index k."""
+    rows = []
+    for i, s in enumerate(solver.streams):
+        surf = int(imp['surface'][i, j, k])
+        rows.append({"Pulley (mm)": int(solver.pulleys[j]), "Speed (m/s)": float(solver.speeds[k]), "Stream": s.title(),
+                     "Surface": CHUTE_EDGES[surf] if surf >= 0 else ("Lewat outlet" if surf == PASSES_OUTLET else "Tidak kena chute"),
+                     "x (m)": round(float(imp['x'][i, j, k]), 3), "y (m)": round(float(imp['y'][i, j, k]), 3),
+                     "V Impact (m/s)": round(float(imp['v'][i, j, k]), 2), "Sudut (°)": round(float(imp['angle'][i, j, k]), 1)})
+    return rows
+
+@figure_cache
+def render_tension(design, segments):
+    prof = run_profile(design, segments)
+    return plots.tension_envelope(prof['x'], prof['z'], prof['T_carry'], prof['T_return'])
+
+@figure_cache
+def render_capacity_chart(material, trough, fill, fmt="png"):
+    return get_table().chart(material, trough, fill, fmt)
+
+def capacity_csv(fill):
+    return get_table().to_frame(fill).to_csv(index=False).encode()
 
 # --- TABS ---
-tabs = st.tabs(["📐 Cross-Section", "🚀 Trajectory & Chute", "🏗️ Layout & Sipil", "📈 Tension & Drive", "📋 BOM & Procurement", "📘 Dasar Teori"])
+tabs = st.tabs(["📐 Cross-Section", "🚀 Trajectory & Chute", "🏗️ Layout & Sipil", "📈 Tension & Drive", "📋 BOM & Procurement", "📘 Dasar Teori", "🎯 Optimizer", "🎲 Uncertainty"])
 
-with tabs[0]:
+with tabs[0], perf.span("tab.cross_section"):
     c1, c2 = st.columns([3, 1])
     with c1:
-        fig, ax = plt.subplots(figsize=(10, 3.5))
-        W_in = sel_w/25.4
-        cr = geo['c_roll']; wr = (W_in - cr)/2; beta = math.radians(trough)
-        p_belt = [(-cr/2 - wr*math.cos(beta), wr*math.sin(beta)), (-cr/2, 0), (cr/2, 0), (cr/2 + wr*math.cos(beta), wr*math.sin(beta))]
-        ax.add_patch(Polygon(p_belt, closed=False, linewidth=5, edgecolor='#2c3e50', facecolor='none'))
-        if fill > 0:
-            scale = math.sqrt(min(fill, 120)/100)
-            bw_viz = geo['bw_max'] * scale
-            wf = max(0, (bw_viz/2 - cr/2))
-            xr = (cr/2) + wf*math.cos(beta); yr = wf*math.sin(beta)
-            xl = -xr; yp = yr + (xr * math.tan(math.radians(mat_data['sur'])))
-            xc = np.linspace(xl, xr, 50); a = (yr - yp)/(xr**2) if xr>0 else 0; yc = a*xc**2 + yp
-            col = '#2ecc71' if fill <= 85 else '#e74c3c'
-            ax.add_patch(Polygon(list(zip(xc, yc)) + ([(xr, yr), (cr/2, 0), (-cr/2, 0), (xl, yr)] if wf>0 else [(xr, 0), (xl, 0)]), closed=True, facecolor=col, alpha=0.8))
-            lump_r = lump/25.4/2
-            lump_c = Circle((0, yr/2), lump_r, color='#9b59b6', alpha=0.6, label='Max Lump')
-            ax.add_patch(lump_c)
-        ax.set_xlim(-W_in/1.5, W_in/1.5); ax.set_ylim(-1, W_in/1.8); ax.set_aspect('equal'); ax.axis('off')
-        st.pyplot(fig)
+        st.image(render_cross_section(sel_w, geo['c_roll'], geo['bw_max'], trough, mat_data['sur'], geo['load_pct'], lump), width="stretch")
     with c2:
         st.info(f"**Analisis Dimensi:**\n\nLebar Belt: {sel_w} mm\nMaterial: {int(geo['bw_act']*25.4)} mm\nEdge Dist: {int(geo['edge_act']*25.4)} mm")
         if geo['lump_ok']: st.success(f"✅ Lump {lump}mm Aman")
         else: st.error(f"❌ Lump {lump}mm Besar!")
 
-with tabs[1]:
+with tabs[1], perf.span("tab.trajectory"):
     c1, c2 = st.columns([1, 3])
     with c1:
         st.markdown("#### Chute Parameters")
@@ -313,40 +238,57 @@ with tabs[1]:
         if p_dia < comp['RecPulley']: st.error(f"⚠️ Pulley < Min {comp['RecPulley']}mm. Risiko Fatig Belt.")
         st.success(f"**Liner Rekomendasi:**\n{mat_data['liner']}")
     with c2:
-        xt, yt, rp, idx = eng.calc_trajectory(p_dia)
-        fig, ax = plt.subplots(figsize=(8, 5)) 
-        ax.add_patch(Circle((0, -rp), rp, color='#95a5a6', alpha=0.5))
-        ax.plot([-2, 0], [-rp + rp, 0], 'k-', linewidth=4)
-        ax.plot(xt, yt, 'b-', linewidth=2, alpha=0.6, label='Flow Stream')
-        hood_x_start = -rp - 0.2; impact_wall_x = max(xt) + 0.5
-        if impact_wall_x < chute_w: impact_wall_x = chute_w
-        chute_points = [(hood_x_start, rp + hood_h), (impact_wall_x, rp + hood_h), (impact_wall_x, -chute_h), (impact_wall_x - chute_w, -chute_h), (hood_x_start, -rp)]
-        ax.add_patch(Polygon(chute_points, closed=False, edgecolor='#e67e22', linewidth=3, facecolor='none', linestyle='--', label='Chute Box'))
-        ax.plot([impact_wall_x, impact_wall_x], [rp, -chute_h], color='#d35400', linewidth=5, alpha=0.5, label='Impact Wall')
-        ax.set_title(f"Trajectory Index: {idx:.2f} ({'High Speed/Tangent' if idx>=1 else 'Low Speed/Wrap'})")
-        ax.grid(True, alpha=0.3); ax.legend(loc='upper left')
-        ax.set_ylim(-chute_h - 0.5, rp + hood_h + 0.5); ax.set_xlim(-1.0, impact_wall_x + 1.0); ax.set_aspect('equal')
-        st.pyplot(fig)
-
-with tabs[2]:
+        st.image(render_trajectory(sel_w, sel_v, p_dia, chute_w, chute_h, hood_h), width="stretch")
+        solver, _, imp = run_impacts(sel_w, sel_v, p_dia, (chute_w, chute_h, hood_h))
+        st.dataframe(pd.DataFrame(impact_rows(solver, imp, 0, 0)).drop(columns=["Pulley (mm)", "Speed (m/s)"]), hide_index=True, width="stretch")
+    with st.expander("📊 Envelope & Impact: Variasi Speed / Pulley"):
+        e1, e2 = st.columns(2)
+        v_lo, v_hi = e1.select_slider("Range Speed (m/s)", options=list(SPEED_RANGE), value=(float(SPEED_RANGE[0]), float(SPEED_RANGE[-1])))
+        pulleys = e2.multiselect("Pulley (mm)", PULLEY_SIZES, default=PULLEY_SIZES)
+        # Isi expander selalu dieksekusi Streamlit; solve semua kombinasi hanya bila diminta.
+        show_env = st.checkbox("Hitung envelope & impact untuk variasi ini", value=False)
+        if pulleys and show_env:
+            speeds = tuple(float(v) for v in SPEED_RANGE if v_lo <= v <= v_hi)
+            chute = (chute_w, chute_h, hood_h)
+            st.image(render_trajectory_envelope(sel_w, sel_v, p_dia, chute, speeds, tuple(sorted(pulleys))), width="stretch")
+            env, _, env_imp = run_impacts(sel_w, sel_v, p_dia, chute, speeds, tuple(sorted(pulleys)))
+            k = int(np.argmin(np.abs(env.speeds - sel_v)))
+            st.caption(f"Impact per pulley pada speed {env.speeds[k]:.1f} m/s:")
+            st.dataframe(pd.DataFrame([r for j in range(len(env.pulleys)) for r in impact_rows(env, env_imp, j, k)]), hide_index=True, width="stretch")
+
+with tabs[2], perf.span("tab.layout"):
     col_b1, col_b2 = st.columns(2)
     with col_b1:
         st.markdown(f"<div class='kpi-card'><div class='kpi-lbl'>Min. Jarak Transisi</div><div class='kpi-val'>{cons['TransDist']:.2f} m</div><small>Jarak dari Pulley ke Idler Trough pertama agar belt tidak sobek.</small></div>", unsafe_allow_html=True)
     with col_b2:
         st.markdown(f"<div class='kpi-card'><div class='kpi-lbl'>Min. Take-up Travel</div><div class='kpi-val'>{cons['TakeupTravel']:.2f} m</div><small>Tinggi area gerak pemberat (Counterweight) untuk kompensasi mulur belt.</small></div>", unsafe_allow_html=True)
 
-with tabs[3]:
-    fig, ax = plt.subplots(figsize=(8, 3))
-    ax.plot([0, length], [pwr['T2'], pwr['T1']], 'r-o', linewidth=2)
-    ax.fill_between([0, length], [pwr['T2'], pwr['T1']], alpha=0.1, color='red')
-    ax.set_ylabel("Tension (lbs)"); ax.set_xlabel("Conveyor Length (m)")
-    ax.set_title("Profil Tegangan Belt")
-    st.pyplot(fig)
-    if pwr['Slip']: st.error(f"⛔ **DRIVE SLIP!** Ratio {pwr['Ratio']:.2f} > 3.0. Tambahkan berat Counterweight.")
-    else: st.success(f"✅ **Traction Aman.** Ratio {pwr['Ratio']:.2f} < 3.0.")
-    st.info(f"**Vertical Curve:** Gunakan Radius cekungan min {comp['Curve']:.1f} meter.")
-
-with tabs[4]:
+with tabs[3], perf.span("tab.tension"):
+    with st.expander("🛤️ Profil Lintasan Multi-Segment (Incline / Decline / Kurva)"):
+        st.caption("Urut dari tail ke head. Radius = radius kurva vertikal di awal flight (0 = tanpa kurva).")
+        seg_df = st.data_editor(pd.DataFrame({"Panjang (m)": [float(length)], "Beda Elevasi (m)": [float(lift)], "Radius Kurva (m)": [0.0]}), num_rows="dynamic", width="stretch")
+    segments = tuple((r["Panjang (m)"], r["Beda Elevasi (m)"], r["Radius Kurva (m)"]) for r in seg_df.fillna(0).to_dict("records") if r["Panjang (m)"] > 0)
+    if not segments: segments = ((float(length), float(lift), 0.0),)
+    prof = run_profile(design, segments)
+    st.image(render_tension(design, segments), width="stretch")
+    p1, p2, p3, p4 = st.columns(4)
+    p1.metric("T1 (Tight Side)", f"{int(prof['T1'])} lbs")
+    p2.metric("T2 (Slack Side)", f"{int(prof['T2'])} lbs")
+    p3.metric("Take-up Force", f"{int(prof['Takeup'])} lbs")
+    p4.metric("Max Sag (Carry)", f"{prof['sag_carry'].max():.1f} %")
+    if len(segments) > 1:
+        st.caption(f"Profil {len(segments)} flight: total {prof['x'][-1]:.0f} m, elevasi {prof['z'][-1]:+.1f} m, power {prof['kW']:.1f} kW (Te {int(prof['Te'])} lbs).")
+    for c in prof['curves']:
+        if c['R_req'] is None: st.info(f"**{c['kind']} curve @ {c['station_m']:.0f} m:** T = {int(c['T'])} lbs.")
+        elif c['ok']: st.success(f"✅ **{c['kind']} curve @ {c['station_m']:.0f} m:** R {c['R']:.0f} m ≥ min {c['R_req']:.0f} m.")
+        else: st.error(f"⛔ **{c['kind']} curve @ {c['station_m']:.0f} m:** radius min {c['R_req']:.0f} m (belt lift-off).")
+    if prof['Slip']: st.error(f"⛔ **DRIVE SLIP!** Ratio {prof['Ratio']:.2f} > 3.0. Tambahkan berat Counterweight.")
+    else: st.success(f"✅ **Traction Aman.** Ratio {prof['Ratio']:.2f} < 3.0.")
+    # Kurva antar flight sudah dicek dari profil di atas; estimasi single-flight hanya bila tidak ada transisi.
+    if not prof['curves']:
+        st.info(f"**Vertical Curve (estimasi single-flight, L {length} m / H {lift} m):** Gunakan Radius cekungan min {comp['Curve']:.1f} meter.")
+
+with tabs[4], perf.span("tab.bom"):
     st.markdown("### 📋 Procurement Spec (BOM)")
     df_bom = pd.DataFrame([
         ["Conveyor Belt", f"EP-{int(pwr['PIW']*1.5/10)*10} Grade {mat_data.get('desc', 'Gen')}", f"{sel_w} mm", f"{int(length*2.1)} m"],
@@ -360,10 +302,14 @@ with tabs[4]:
     # PDF DOWNLOAD BUTTON
     st.markdown("---")
     st.write("**Download Report Resmi:**")
-    pdf_bytes = create_pdf()
-    st.download_button(label="📄 Download Datasheet (PDF)", data=pdf_bytes, file_name="PetroStream_Report.pdf", mime="application/pdf")
-
-with tabs[5]:
+    st.download_button(label="📄 Download Datasheet (PDF)", data=partial(create_pdf, design), file_name="PetroStream_Report.pdf", mime="application/pdf")
+    with st.expander("📦 Batch Report Proyek (banyak conveyor)"):
+        st.caption("CSV kolom: tag, material, cap, width, speed, length, lift, trough (opsional), lump (opsional). Hasil: ZIP berisi 1 datasheet per conveyor.")
+        proj = st.file_uploader("Daftar Conveyor Proyek (CSV)", type=["csv"])
+        if proj is not None:
+            st.download_button(label="🗂️ Download Semua Datasheet (ZIP)", data=partial(create_project_zip, proj.getvalue()), file_name="PetroStream_Project_Reports.zip", mime="application/zip")
+
+with tabs[5], perf.span("tab.theory"):
     st.markdown("### 📘 Dasar Teori (CEMA 6th Ed)")
     st.markdown("<div class='theory-box'><h4>1. Kapasitas ($A_s$)</h4><p>Luas penampang material di atas belt (Trapesium + Surcharge).</p></div>", unsafe_allow_html=True)
     st.latex(r"TPH = \frac{60 \times A_s \times V \times \gamma}{2000}")
@@ -371,6 +317,129 @@ with tabs[5]:
     st.latex(r"T_e = L \cdot K_t (K_x + K_y W_b + 0.015 W_b) + W_m (L K_y + H) + T_{ac}")
     st.markdown("<div class='theory-box'><h4>3. Slip Check (Euler)</h4><p>Memastikan belt tidak selip di pulley penggerak.</p></div>", unsafe_allow_html=True)
     st.latex(r"\frac{T_1}{T_2} \le e^{\mu \theta}")
+    with st.expander("📊 Capacity Chart & Query Kapasitas"):
+        tbl = get_table()
+        q1, q2, q3 = st.columns(3)
+        ch_mat = q1.selectbox("Material", tbl.materials, index=tbl.materials.index(sel_mat))
+        ch_tr = q2.radio("Trough", [int(t) for t in tbl.troughs], index=1, horizontal=True)
+        ch_fill = q3.select_slider("Load (%)", [70, 75, 80, 85, 90, 100], value=85)
+        st.image(render_capacity_chart(ch_mat, ch_tr, ch_fill), width="stretch")
+        r1, r2 = st.columns(2)
+        with r1:
+            q_w = st.selectbox("Lebar (mm)", [int(w) for w in tbl.widths], index=[int(w) for w in tbl.widths].index(sel_w) if sel_w in tbl.widths else 0)
+            q_v = st.slider("Speed (m/s)", float(tbl.speeds[0]), float(tbl.speeds[-1]), float(sel_v), 0.1)
+            st.metric(f"TPH Maks @ {ch_fill}%", f"{float(tbl.capacity(ch_mat, q_w, q_v, ch_tr, ch_fill)):,.0f} TPH")
+        with r2:
+            q_tph = st.number_input("Target TPH", 10, 10000, int(cap))
+            best_w = tbl.smallest_width(ch_mat, q_tph, None, ch_tr, ch_fill)
+            st.metric("Belt Terkecil (@ max speed material)", f"{best_w} mm" if best_w else "Tidak ada")
+            if best_w: st.caption(f"Speed minimum untuk {best_w} mm: {tbl.min_speed(ch_mat, q_tph, best_w, ch_tr, ch_fill)} m/s")
+        d1, d2 = st.columns(2)
+        d1.download_button("⬇️ Chart (SVG)", data=partial(render_capacity_chart, ch_mat, ch_tr, ch_fill, "svg"), file_name=f"capacity_{ch_mat}_{ch_tr}.svg", mime="image/svg+xml")
+        d2.download_button("⬇️ Tabel Kapasitas (CSV)", data=partial(capacity_csv, ch_fill), file_name=f"capacity_table_{ch_fill}.csv", mime="text/csv")
+
+# Fragment: interaksi di tab Optimizer tidak me-rerun seluruh halaman.
+@st.fragment
+def optimizer_panel():
+    OPT_COLS = ["material", "width", "speed", "trough", "load_pct", "kW", "PIW", "Series", "RecPulley", "Ratio"]
+    c1, c2 = st.columns([1, 3])
+    with c1:
+        st.markdown("#### Ruang Desain")
+        opt_v = st.slider("Rentang Speed (m/s)", 0.5, 6.0, (0.5, 6.0), 0.1)
+        opt_step = st.select_slider("Step Speed (m/s)", [0.01, 0.05, 0.1, 0.25], value=0.1)
+        opt_tr = st.multiselect("Trough Angle", STD_TROUGHS, default=STD_TROUGHS)
+        opt_all = st.checkbox("Sweep semua material", value=False)
+        run_opt = st.button("🚀 Jalankan Optimasi", disabled=not opt_tr)
+    opt_key = (sel_mat, cap, length, lift, lump, opt_v, opt_step, tuple(opt_tr), opt_all)
+    with c2:
+        if run_opt:
+            mats = list(mat_db.keys()) if opt_all else [sel_mat]
+            speeds = np.round(np.arange(opt_v[0], opt_v[1] + 1e-9, opt_step), 2)
+            bar = st.progress(0.0, text="Menyiapkan sweep...")
+            live = st.empty()
+            parts, top = [], None
+            with perf.span("optimizer.sweep"):
+                for done, total, part in sweep(cap, length, lift, lump, mats, STD_WIDTHS, speeds, opt_tr):
+                    parts.append(part)
+                    top = rank(merge([top, part] if top else [part]))
+                    top = {k: v[:10] for k, v in top.items()}
+                    bar.progress(done/total, text=f"{done:,} / {total:,} desain dievaluasi")
+                    live.dataframe(pd.DataFrame({k: top[k] for k in OPT_COLS}), hide_index=True)
+            bar.empty(); live.empty()
+            res = rank(merge(parts))
+            front = pareto_mask(res)
+            png = plots.pareto_front(res['kW'], res['PIW'], res['load_pct'], front) if len(res['kW']) else None
+            st.session_state['opt_result'] = (opt_key, res, front, png)
+        saved = st.session_state.get('opt_result')
+        if saved is None or saved[0] != opt_key:
+            st.info("Atur ruang desain lalu tekan **Jalankan Optimasi**. Desain feasible: load ≤ 85% & lump aman; diurutkan berdasarkan slip, kW, PIW, kelas idler.")
+            return
+        _, res, front, png = saved
+        if not len(res['kW']):
+            st.error("⛔ Tidak ada desain feasible pada ruang desain ini.")
+            return
+        st.success(f"✅ {len(res['kW']):,} desain feasible | {int(front.sum())} desain Pareto-optimal")
+        st.markdown("##### 🏆 Ranking Desain Terbaik")
+        st.dataframe(pd.DataFrame({k: res[k][:20] for k in OPT_COLS}), hide_index=True)
+        st.image(png, width="stretch")
+
+with tabs[6], perf.span("tab.optimizer"):
+    optimizer_panel()
+
+@engine_cache
+def run_uncertainty(design, n, seed, spread):
+    with perf.span("uncertainty.monte_carlo"):
+        return run_monte_carlo(design, n, seed, dict(spread))
+
+@figure_cache
+def render_uncertainty(design, n, seed, spread):
+    mc = run_uncertainty(design, n, seed, spread)
+    return plots.uncertainty_hist(mc['load_hist'], mc['kW_hist'], mc['kW_p95'], SPILL_PCT, OVERLOAD_PCT)
+
+@st.fragment
+def uncertainty_panel():
+    c1, c2 = st.columns([1, 3])
+    with c1:
+        st.markdown("#### Sebaran Input")
+        den_cv = st.slider("CV Density (%)", 0.0, 20.0, SPREAD['den_cv']*100, 0.5, help="Variasi bulk density akibat kadar air.") / 100
+        sur_sd = st.slider("Std Surcharge (°)", 0.0, 10.0, SPREAD['sur_sd'], 0.5)
+        cap_cv = st.slider("CV Feed Rate (%)", 0.0, 20.0, SPREAD['cap_cv']*100, 0.5) / 100
+        surge_prob = st.slider("Peluang Surge (%)", 0.0, 50.0, SPREAD['surge_prob']*100, 1.0) / 100
+        surge_max = st.slider("Surge Maks (% TPH)", 0.0, 100.0, SPREAD['surge_max']*100, 5.0) / 100
+        n = st.select_slider("Jumlah Sampel", [100_000, 200_000, 500_000, MAX_SAMPLES], value=N_SAMPLES)
+        seed = st.number_input("Seed", 0, 2**31 - 1, 42)
+        run_mc = st.button("🎲 Jalankan Simulasi")
+    spread = (("den_cv", den_cv), ("sur_sd", sur_sd), ("cap_cv", cap_cv), ("surge_prob", surge_prob), ("surge_max", surge_max))
+    # Monte Carlo hanya jalan saat diminta; hasil di-cache per (desain, sampel, seed, sebaran).
+    mc_key = (design, n, int(seed), spread)
+    if run_mc:
+        st.session_state['mc_key'] = mc_key
+    if st.session_state.get('mc_key') != mc_key:
+        c2.info("Atur sebaran input lalu tekan **Jalankan Simulasi** untuk menghitung probabilitas overload, spill & slip desain ini.")
+        return
+    mc = run_uncertainty(design, n, int(seed), spread)
+    with c2:
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric("P(Overload >100%)", f"{mc['p_overload']*100:.2f} %")
+        m2.metric("P(Spill >85%)", f"{mc['p_spill']*100:.2f} %")
+        m3.metric("P(Slip, Ratio >3)", f"{mc['p_slip']*100:.2f} %")
+        m4.metric("P95 Power", f"{mc['kW_p95']:.2f} kW", f"{mc['kW_p95'] - pwr['kW']:+.2f} vs nominal", delta_color="inverse")
+        st.image(render_uncertainty(design, n, int(seed), spread), width="stretch")
+        st.caption(f"{mc['n']:,} sampel | Load P50 {mc['load_p50']:.1f}% / P95 {mc['load_p95']:.1f}% | PIW P95 {mc['PIW_p95']:.0f}")
+
+with tabs[7], perf.span("tab.uncertainty"):
+    uncertainty_panel()
+
+perf.end_trace(perf_trace)
+if PERF_PANEL:
+    with st.sidebar.expander("⏱️ Performance", expanded=True):
+        st.metric("Rerun Total", f"{perf_trace.total_ms:.0f} ms")
+        if perf_trace.spans:
+            st.dataframe(pd.DataFrame(perf_trace.spans).round({"start_ms": 1, "ms": 2}), hide_index=True, width="stretch")
+        mem = perf_trace.memory()
+        if mem['peak_rss_kb'] is not None:
+            st.caption(f"RSS {(mem['rss_end_kb'] or 0)/1024:.0f} MiB | Peak RSS {mem['peak_rss_kb']/1024:.0f} MiB (peak proses, naik +{mem['peak_growth_kb']/1024:.1f} MiB selama rerun ini; termasuk sesi lain)")
+        st.dataframe(pd.DataFrame(cache_stats()).set_index("cache")[["entries", "hits", "misses", "hit_rate", "evictions"]], width="stretch")
 
 st.markdown("---")
 st.caption("PetroStream™ v17.0 | Developed for PT Petrokimia Gresik | CEMA Standard")